@@ -1,141 +1,286 @@
-from __future__ import annotations
-
-import json
-import shutil
-from pathlib import Path
-from typing import List
-
-
-def _read_manifest_json(manifest_path: Path) -> dict:
-    """
-    Read manifest.json robustly:
-    - handles UTF-8 BOM (utf-8-sig)
-    - handles leading/trailing whitespace
-    - throws ValueError if empty
-    """
-    text = manifest_path.read_text(encoding="utf-8-sig").strip()
-    if not text:
-        raise ValueError("manifest.json is empty")
-    return json.loads(text)
-
-
-def _copy_item(src: Path, dst: Path) -> None:
-    """Copy a file or directory into destination path."""
-    if src.is_dir():
-        dst.mkdir(parents=True, exist_ok=True)
-        for child in src.iterdir():
-            if child.is_dir():
-                shutil.copytree(child, dst / child.name, dirs_exist_ok=True)
-            else:
-                (dst / child.name).parent.mkdir(parents=True, exist_ok=True)
-                shutil.copy2(child, dst / child.name)
-    else:
-        dst.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(src, dst)
-
-
-def _build_config_mod(src_mod: Path, dst_mod: Path) -> None:
-    """
-    Build a config-type mod using manifest.json copy[].
-    - Always includes manifest.json in the destination.
-    - If copy[] is missing/empty, falls back to copying the whole folder.
-    """
-    manifest_path = src_mod / "manifest.json"
-
-    # If manifest doesn't exist, treat as folder copy
-    if not manifest_path.exists():
-        shutil.copytree(src_mod, dst_mod, dirs_exist_ok=True)
-        return
-
-    try:
-        data = _read_manifest_json(manifest_path)
-    except Exception:
-        # If manifest is unreadable, safest fallback is full folder copy
-        shutil.copytree(src_mod, dst_mod, dirs_exist_ok=True)
-        return
-
-    copy_list = data.get("copy", [])
-    if not isinstance(copy_list, list) or len(copy_list) == 0:
-        # Fallback: copy whole mod folder (includes manifest)
-        shutil.copytree(src_mod, dst_mod, dirs_exist_ok=True)
-        return
-
-    dst_mod.mkdir(parents=True, exist_ok=True)
-
-    # Always copy manifest.json
-    shutil.copy2(manifest_path, dst_mod / "manifest.json")
-
-    for entry in copy_list:
-        entry = str(entry).strip()
-        if not entry:
-            continue
-
-        # Normalize slashes
-        entry = entry.replace("\\", "/")
-
-        is_dir = entry.endswith("/")
-        rel = entry[:-1] if is_dir else entry
-
-        # Security/safety: don't allow copy entries to escape the mod folder
-        # (e.g. "../something")
-        if rel.startswith("../") or rel.startswith("..\\") or "/../" in rel or "\\..\\" in rel:
-            continue
-
-        src_item = src_mod / rel
-        dst_item = dst_mod / rel
-
-        if not src_item.exists():
-            continue
-
-        _copy_item(src_item, dst_item)
-
-
-def build_active(mods_root: Path, enabled_rel_paths: List[str]) -> Path:
-    """
-    Build mods/_active as a generated, per-mod folder structure.
-
-    enabled_rel_paths examples:
-      - "configs/EstellaMod"
-      - "skins/CoolSkinPack"
-
-    Returns the active root path.
-    """
-    active_root = mods_root / "_active"
-
-    # Wipe and recreate
-    if active_root.exists():
-        shutil.rmtree(active_root)
-    active_root.mkdir(parents=True, exist_ok=True)
-
-    for rel in enabled_rel_paths:
-        rel = str(rel).replace("\\", "/").strip()
-        if not rel or rel.startswith("#"):
-            continue
-
-        # Safety: never allow building from inside _active
-        if rel.startswith("_active/") or rel == "_active":
-            continue
-
-        src = mods_root / rel
-        if not src.exists():
-            continue
-
-        dst = active_root / rel
-        dst.parent.mkdir(parents=True, exist_ok=True)
-
-        manifest = src / "manifest.json"
-        mod_type = "folder"
-
-        if manifest.exists():
-            try:
-                data = _read_manifest_json(manifest)
-                mod_type = str(data.get("type") or "folder").lower().strip()
-            except Exception:
-                mod_type = "folder"
-
-        if mod_type == "config":
-            _build_config_mod(src, dst)
-        else:
-            shutil.copytree(src, dst, dirs_exist_ok=True)
-
-    return active_root
+from __future__ import annotations
+
+import shutil
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from launcher.core.deploy import (
+    LogFn,
+    _ACTIVE_STATE_NAME,
+    _MAX_COPY_WORKERS,
+    _fast_copytree,
+    _fast_rmtree,
+    _fastcopy,
+    _link_or_copy,
+    _link_tree,
+    _make_parents,
+    _norm_rel,
+    _scandir_walk,
+)
+from launcher.core.jsonio import dumps_indented, read_json_fast, read_manifest
+
+
+def _read_manifest_json(manifest_path: Path) -> dict:
+    """
+    Read manifest.json robustly:
+    - handles UTF-8 BOM (byte-sliced, no utf-8-sig decode pass)
+    - handles leading/trailing whitespace
+    - throws ValueError if empty
+    Parses are memoized per (path, mtime) — see jsonio.read_manifest.
+    """
+    data = read_manifest(manifest_path)
+    if not data:
+        raise ValueError("manifest.json is empty")
+    return data
+
+
+def _copy_item(src: Path, dst: Path, link: bool = False) -> None:
+    """Copy (or hardlink/reflink) a file or directory into destination path."""
+    if src.is_dir():
+        if link:
+            _link_tree(src, dst)
+            return
+        dst.mkdir(parents=True, exist_ok=True)
+        # dst itself was just created; no per-child mkdir needed
+        for child in src.iterdir():
+            if child.is_dir():
+                shutil.copytree(child, dst / child.name, dirs_exist_ok=True)
+            else:
+                shutil.copy2(child, dst / child.name)
+    else:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        if link:
+            _link_or_copy(src, dst)
+        else:
+            shutil.copy2(src, dst)
+
+
+def _build_config_mod(src_mod: Path, dst_mod: Path, link: bool = False) -> None:
+    """
+    Build a config-type mod using manifest.json copy[].
+    - Always includes manifest.json in the destination.
+    - If copy[] is missing/empty, falls back to copying the whole folder.
+    """
+    copy_tree = _link_tree if link else _fast_copytree
+    manifest_path = src_mod / "manifest.json"
+
+    # If manifest doesn't exist, treat as folder copy
+    if not manifest_path.exists():
+        copy_tree(src_mod, dst_mod)
+        return
+
+    try:
+        data = _read_manifest_json(manifest_path)
+    except Exception:
+        # If manifest is unreadable, safest fallback is full folder copy
+        copy_tree(src_mod, dst_mod)
+        return
+
+    copy_list = data.get("copy", [])
+    if not isinstance(copy_list, list) or len(copy_list) == 0:
+        # Fallback: copy whole mod folder (includes manifest)
+        copy_tree(src_mod, dst_mod)
+        return
+
+    dst_mod.mkdir(parents=True, exist_ok=True)
+
+    # Always copy manifest.json
+    shutil.copy2(manifest_path, dst_mod / "manifest.json")
+
+    for entry in copy_list:
+        entry = str(entry).strip()
+        if not entry:
+            continue
+
+        # Normalize slashes
+        entry = entry.replace("\\", "/")
+
+        is_dir = entry.endswith("/")
+        rel = entry[:-1] if is_dir else entry
+
+        # Security/safety: don't allow copy entries to escape the mod folder
+        # (e.g. "../something")
+        if rel.startswith("../") or rel.startswith("..\\") or "/../" in rel or "\\..\\" in rel:
+            continue
+
+        src_item = src_mod / rel
+        dst_item = dst_mod / rel
+
+        if not src_item.exists():
+            continue
+
+        _copy_item(src_item, dst_item, link)
+
+
+# Build-state sidecar inside _active: records which mods the last build
+# staged and a content fingerprint per mod, so rebuilds only touch the
+# delta instead of wiping and re-copying everything on every toggle.
+# (The name itself lives in deploy, which skips it when copying _active
+# into the game tree.)
+_STATE_NAME = _ACTIVE_STATE_NAME
+
+
+def _mod_fingerprint(src: Path) -> int:
+    """
+    CRC over every file's (rel path, size, mtime_ns) under src — the
+    same metadata the deploy receipt trusts. One metadata walk, no byte
+    reads, and stable across runs so it can be persisted.
+    """
+    crc = 0
+    for entry, rel in sorted(_scandir_walk(src), key=lambda t: t[1]):
+        try:
+            st = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        crc = zlib.crc32(
+            f"{rel}:{st.st_size}:{st.st_mtime_ns}".encode("utf-8", "replace"), crc
+        )
+    return crc
+
+
+def _load_build_state(active_root: Path, use_hardlinks: bool) -> Dict[str, int]:
+    """Previous build's {rel: fingerprint}, or {} when a full rebuild is due."""
+    try:
+        data = read_json_fast(active_root / _STATE_NAME)
+    except Exception:
+        return {}
+    if not isinstance(data, dict) or bool(data.get("use_hardlinks")) != use_hardlinks:
+        # Link/copy mode changed: staged trees are not equivalent, rebuild
+        return {}
+    mods = data.get("mods")
+    if not isinstance(mods, dict):
+        return {}
+    return {str(k): int(v) for k, v in mods.items() if isinstance(v, int)}
+
+
+def build_active(
+    mods_root: Path,
+    enabled_rel_paths: List[str],
+    use_hardlinks: bool = False,
+    log_fn: Optional[LogFn] = None,
+) -> Path:
+    """
+    Build mods/_active as a generated, per-mod folder structure.
+
+    enabled_rel_paths examples:
+      - "configs/EstellaMod"
+      - "skins/CoolSkinPack"
+
+    With use_hardlinks the staging tree is hardlinked/reflinked instead
+    of copied — _active is read-only input to deploy, so sharing storage
+    with the source mods is safe and skips the byte copy entirely.
+
+    Builds are incremental: a .manifest sidecar records what the last
+    build staged, so toggling one mod restages one mod. Mods whose
+    source metadata fingerprint is unchanged are kept as-is; disabled
+    mods are unlinked; anything stale is rebuilt.
+
+    Returns the active root path.
+    """
+    active_root = mods_root / "_active"
+    active_root.mkdir(parents=True, exist_ok=True)
+
+    prev = _load_build_state(active_root, use_hardlinks)
+    if not prev:
+        # No trustworthy record of what's staged — first build, a
+        # missing/corrupt sidecar, or a link/copy mode switch. The
+        # removal pass below can only unlink what the state remembers,
+        # so start from an empty tree or stale mods would linger into
+        # the deploy.
+        _fast_rmtree(active_root, ignore_errors=True)
+        active_root.mkdir(parents=True, exist_ok=True)
+
+    # Each enabled mod copies into its own subtree of _active, so the
+    # per-mod builds are independent and can run on a thread pool.
+    jobs: List[tuple[Path, Path]] = []
+    new_state: Dict[str, int] = {}
+
+    for rel in enabled_rel_paths:
+        rel = _norm_rel(str(rel))
+        if not rel or rel.startswith("#"):
+            continue
+
+        # Safety: never allow building from inside _active
+        if rel.startswith("_active/") or rel == "_active":
+            continue
+
+        src = mods_root / rel
+        if not src.exists():
+            continue
+
+        dst = active_root / rel
+        fp = _mod_fingerprint(src)
+        new_state[rel] = fp
+
+        if prev.get(rel) == fp and dst.exists():
+            continue  # staged copy is current
+
+        if dst.exists():
+            _fast_rmtree(dst)
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        jobs.append((src, dst))
+
+    # Drop staged trees for mods that are no longer enabled
+    removed = 0
+    for rel in prev:
+        if rel not in new_state:
+            stale = active_root / rel
+            if stale.exists():
+                _fast_rmtree(stale, ignore_errors=True)
+            removed += 1
+
+    def _mod_type_of(src: Path) -> str:
+        manifest = src / "manifest.json"
+        if manifest.exists():
+            try:
+                data = _read_manifest_json(manifest)
+                return str(data.get("type") or "folder").lower().strip()
+            except Exception:
+                pass
+        return "folder"
+
+    config_jobs: List[tuple[Path, Path]] = []
+    tree_jobs: List[tuple[Path, Path]] = []
+    for src, dst in jobs:
+        (config_jobs if _mod_type_of(src) == "config" else tree_jobs).append((src, dst))
+
+    for src, dst in config_jobs:
+        _build_config_mod(src, dst, link=use_hardlinks)
+
+    if use_hardlinks:
+        for src, dst in tree_jobs:
+            _link_tree(src, dst)
+    elif tree_jobs:
+        # Flat emission across all stale mods: one (src, dst) pair list,
+        # each unique parent dir created once, and the copies fanned out
+        # on the pool through _fastcopy — no per-mod subprocess spawn
+        # and no repeated mkdir checks on overlapping layouts.
+        pairs: List[tuple[Path, Path]] = []
+        for src, dst in tree_jobs:
+            dst.mkdir(parents=True, exist_ok=True)
+            for entry, rel in _scandir_walk(src):
+                pairs.append((Path(entry.path), dst / rel))
+
+        _make_parents(d for _, d in pairs)
+
+        if len(pairs) > 1:
+            with ThreadPoolExecutor(max_workers=min(_MAX_COPY_WORKERS, len(pairs))) as pool:
+                list(pool.map(lambda pair: _fastcopy(pair[0], pair[1]), pairs))
+        else:
+            for src_file, dst_file in pairs:
+                _fastcopy(src_file, dst_file)
+
+    if new_state != prev:
+        (active_root / _STATE_NAME).write_bytes(
+            dumps_indented({"use_hardlinks": use_hardlinks, "mods": new_state})
+        )
+
+    if log_fn is not None:
+        if not jobs and not removed:
+            log_fn(f"[Build] _active up to date ({len(new_state)} mod(s))")
+        else:
+            log_fn(f"[Build] staged {len(jobs)} mod(s), removed {removed}")
+
+    return active_root
@@ -1,104 +1,153 @@
-from __future__ import annotations
-
-import json
-from dataclasses import dataclass, field
-from pathlib import Path
-from typing import List, Optional
-
-
-@dataclass
-class AppConfig:
-    config_path: Path
-    enabled_mods: List[str] = field(default_factory=list)   # e.g. "configs/EstellaMod"
-    game_exe: Optional[str] = None                          # full path string
-    current_preset: str = "A"                               # "A" / "B" / "C"
-
-    @staticmethod
-    def load(project_root: Path) -> "AppConfig":
-        data_dir = project_root / "launcher" / "data"
-        data_dir.mkdir(parents=True, exist_ok=True)
-        cfg_path = data_dir / "config.json"
-
-        if cfg_path.exists():
-            # BOM-safe
-            data = json.loads(cfg_path.read_text(encoding="utf-8-sig"))
-            enabled = data.get("enabled_mods", [])
-            if not isinstance(enabled, list):
-                enabled = []
-            enabled = [str(x).replace("\\", "/") for x in enabled]
-
-            game_exe = data.get("game_exe")
-            if game_exe is not None:
-                game_exe = str(game_exe)
-
-            preset = str(data.get("current_preset") or "A").upper()
-            if preset not in ("A", "B", "C"):
-                preset = "A"
-
-            return AppConfig(cfg_path, enabled, game_exe, preset)
-
-        cfg = AppConfig(cfg_path, [], None, "A")
-        cfg.save()
-        return cfg
-
-    def save(self) -> None:
-        self.config_path.write_text(
-            json.dumps(
-                {
-                    "enabled_mods": self.enabled_mods,
-                    "game_exe": self.game_exe,
-                    "current_preset": self.current_preset,
-                },
-                indent=2
-            ),
-            encoding="utf-8"
-        )
-
-    def is_enabled(self, rel_path: str) -> bool:
-        rel_path = rel_path.replace("\\", "/")
-        return rel_path in self.enabled_mods
-
-    def set_enabled(self, rel_path: str, enabled: bool) -> None:
-        rel_path = rel_path.replace("\\", "/")
-        if enabled and rel_path not in self.enabled_mods:
-            self.enabled_mods.append(rel_path)
-        if (not enabled) and rel_path in self.enabled_mods:
-            self.enabled_mods.remove(rel_path)
-        self.save()
-
-    def set_game_exe(self, exe_path: str | None) -> None:
-        self.game_exe = exe_path
-        self.save()
-
-    # ---------- Presets ----------
-    def _preset_path(self, name: str) -> Path:
-        name = str(name).strip().upper()
-        if name not in ("A", "B", "C"):
-            name = "A"
-        return self.config_path.parent / f"preset_{name}.json"
-
-    def save_preset(self, name: str) -> None:
-        name = str(name).strip().upper()
-        if name not in ("A", "B", "C"):
-            name = "A"
-        p = self._preset_path(name)
-        payload = {"enabled_mods": [x.replace("\\", "/") for x in self.enabled_mods]}
-        p.write_text(json.dumps(payload, indent=2), encoding="utf-8")
-        self.current_preset = name
-        self.save()
-
-    def load_preset(self, name: str) -> None:
-        name = str(name).strip().upper()
-        if name not in ("A", "B", "C"):
-            name = "A"
-        p = self._preset_path(name)
-        if p.exists():
-            data = json.loads(p.read_text(encoding="utf-8-sig"))
-            enabled = data.get("enabled_mods", [])
-            if not isinstance(enabled, list):
-                enabled = []
-            self.enabled_mods = [str(x).replace("\\", "/") for x in enabled]
-        else:
-            self.enabled_mods = []
-        self.current_preset = name
-        self.save()
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from launcher.core.jsonio import dumps_indented, read_json_fast, write_bytes_atomic
+
+
+@dataclass
+class AppConfig:
+    config_path: Path
+    enabled_mods: List[str] = field(default_factory=list)   # e.g. "configs/EstellaMod"
+    game_exe: Optional[str] = None                          # full path string
+    current_preset: str = "A"                               # "A" / "B" / "C"
+    use_hardlinks: bool = False                             # link instead of copy when staging
+
+    def __post_init__(self) -> None:
+        # Companion set for O(1) membership; enabled_mods stays a list to
+        # keep JSON round-trip order.
+        self._enabled_set = set(self.enabled_mods)
+        # Debounced-save state: rapid toggles mark the config dirty and a
+        # short timer coalesces them into one write (see save_debounced).
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._save_lock = threading.Lock()
+
+    @staticmethod
+    def load(project_root: Path) -> "AppConfig":
+        data_dir = project_root / "launcher" / "data"
+        data_dir.mkdir(parents=True, exist_ok=True)
+        cfg_path = data_dir / "config.json"
+
+        if cfg_path.exists():
+            # BOM-safe (byte-level, no utf-8-sig decode pass)
+            data = read_json_fast(cfg_path)
+            enabled = data.get("enabled_mods", [])
+            if not isinstance(enabled, list):
+                enabled = []
+            enabled = [str(x).replace("\\", "/") for x in enabled]
+
+            game_exe = data.get("game_exe")
+            if game_exe is not None:
+                game_exe = str(game_exe)
+
+            preset = str(data.get("current_preset") or "A").upper()
+            if preset not in ("A", "B", "C"):
+                preset = "A"
+
+            use_hardlinks = bool(data.get("use_hardlinks", False))
+
+            return AppConfig(cfg_path, enabled, game_exe, preset, use_hardlinks)
+
+        cfg = AppConfig(cfg_path, [], None, "A")
+        cfg.save()
+        return cfg
+
+    def save_debounced(self, delay_s: float = 0.25) -> None:
+        """
+        Schedule a single save shortly after the last change instead of
+        rewriting config.json on every toggle. Enabling 50 mods in a row
+        costs one write, not 50.
+        """
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+            timer = threading.Timer(delay_s, self.flush)
+            timer.daemon = True
+            self._save_timer = timer
+            timer.start()
+
+    def flush(self) -> None:
+        """Write any pending debounced changes now (shutdown, pre-deploy)."""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+        self.save()
+
+    def save(self) -> None:
+        # Runs on the debounce timer thread as well as the GUI thread:
+        # snapshot the payload under the lock (the list copy is one
+        # C-level op) so serialization never walks a list the GUI is
+        # mid-mutation on.
+        with self._save_lock:
+            payload = {
+                "enabled_mods": list(self.enabled_mods),
+                "game_exe": self.game_exe,
+                "current_preset": self.current_preset,
+                "use_hardlinks": self.use_hardlinks,
+            }
+        write_bytes_atomic(self.config_path, dumps_indented(payload))
+
+    def is_enabled(self, rel_path: str) -> bool:
+        # Hot path: the list view asks this per row per paint. rel_path
+        # comes from the scanner, which is already slash-normalized, so
+        # this is one set lookup with no string work.
+        return rel_path in self._enabled_set
+
+    def set_enabled(self, rel_path: str, enabled: bool) -> None:
+        rel_path = rel_path.replace("\\", "/")
+        if enabled and rel_path not in self._enabled_set:
+            self.enabled_mods.append(rel_path)
+            self._enabled_set.add(rel_path)
+        elif (not enabled) and rel_path in self._enabled_set:
+            self.enabled_mods.remove(rel_path)
+            self._enabled_set.discard(rel_path)
+        else:
+            return  # no change — don't schedule a write
+        self.save_debounced()
+
+    def set_game_exe(self, exe_path: str | None) -> None:
+        self.game_exe = exe_path
+        self.save_debounced()
+
+    # ---------- Presets ----------
+    def _preset_path(self, name: str) -> Path:
+        name = str(name).strip().upper()
+        if name not in ("A", "B", "C"):
+            name = "A"
+        return self.config_path.parent / f"preset_{name}.json"
+
+    def save_preset(self, name: str) -> None:
+        name = str(name).strip().upper()
+        if name not in ("A", "B", "C"):
+            name = "A"
+        p = self._preset_path(name)
+        payload = {"enabled_mods": [x.replace("\\", "/") for x in self.enabled_mods]}
+        write_bytes_atomic(p, dumps_indented(payload))
+        self.current_preset = name
+        self.save_debounced()
+
+    def load_preset(self, name: str) -> None:
+        name = str(name).strip().upper()
+        if name not in ("A", "B", "C"):
+            name = "A"
+        p = self._preset_path(name)
+        if p.exists():
+            data = read_json_fast(p)
+            enabled = data.get("enabled_mods", [])
+            if not isinstance(enabled, list):
+                enabled = []
+            self.enabled_mods = [str(x).replace("\\", "/") for x in enabled]
+        else:
+            self.enabled_mods = []
+        self._enabled_set = set(self.enabled_mods)
+        self.current_preset = name
+        self.save_debounced()
@@ -1,558 +1,992 @@
-from __future__ import annotations
-
-import json
-import shutil
-from dataclasses import dataclass
-from pathlib import Path  # ✅ FIX: Path is defined now
-from typing import Callable, Dict, List, Optional, Tuple
-
-
-# =========================================================
-# Existing ModSafe deploy (VFS / StreamingAssets)
-# =========================================================
-
-@dataclass
-class DeployResult:
-    safe_root: Path          # .../Endfield_Data/Persistent/VFS/EndfieldModSafe
-    dest_active: Path        # .../Endfield_Data/Persistent/VFS/EndfieldModSafe/active
-    receipt_path: Path       # .../Endfield_Data/Persistent/VFS/EndfieldModSafe/receipt.json
-    file_count: int
-    backend: str             # "vfs" or "streamingassets"
-
-
-def _read_json(path: Path) -> dict:
-    text = path.read_text(encoding="utf-8-sig", errors="ignore").strip()
-    if not text:
-        return {}
-    return json.loads(text)
-
-
-def _copy_tree_merge(src: Path, dst: Path) -> int:
-    """
-    Copy src -> dst (recursive), overwrite files, create folders as needed.
-    Returns number of files copied.
-    """
-    count = 0
-    if not src.exists():
-        return 0
-
-    if src.is_file():
-        dst.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(src, dst)
-        return 1
-
-    for p in src.rglob("*"):
-        rel = p.relative_to(src)
-        out = dst / rel
-        if p.is_dir():
-            out.mkdir(parents=True, exist_ok=True)
-        else:
-            out.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(p, out)
-            count += 1
-    return count
-
-
-def _pick_backend_root(game_exe: str) -> Tuple[str, Path]:
-    """
-    Prefer Endfield_Data/Persistent/VFS if it exists,
-    otherwise fall back to Endfield_Data/StreamingAssets.
-    """
-    game_root = Path(game_exe).resolve().parent
-    endfield_data = game_root / "Endfield_Data"
-
-    vfs_root = endfield_data / "Persistent" / "VFS"
-    if vfs_root.exists():
-        return "vfs", vfs_root
-
-    sa_root = endfield_data / "StreamingAssets"
-    sa_root.mkdir(parents=True, exist_ok=True)
-    return "streamingassets", sa_root
-
-
-def get_modsafe_paths(game_exe: str, folder_name: str = "EndfieldModSafe") -> Tuple[str, Path, Path]:
-    """
-    Returns (backend, safe_root, dest_active)
-    """
-    backend, base = _pick_backend_root(game_exe)
-    safe_root = (base / folder_name).resolve()
-    dest_active = (safe_root / "active").resolve()
-    return backend, safe_root, dest_active
-
-
-def deploy_endfield_modsafe(
-    project_root: Path,
-    mods_root: Path,
-    enabled_mods: List[str],
-    game_exe: str,
-    folder_name: str = "EndfieldModSafe",
-) -> DeployResult:
-    """
-    Copies the project's built active pack into the game's *real* mount location:
-    - Prefer: Endfield_Data/Persistent/VFS/<folder_name>/active
-    - Fallback: Endfield_Data/StreamingAssets/<folder_name>/active
-
-    Assumes build_active() creates: <project>/mods/_active/...
-    """
-    backend, safe_root, dest_active = get_modsafe_paths(game_exe, folder_name)
-    safe_root.mkdir(parents=True, exist_ok=True)
-    dest_active.mkdir(parents=True, exist_ok=True)
-
-    src_active = (mods_root / "_active").resolve()
-    if not src_active.exists():
-        raise FileNotFoundError(f"Active pack not found: {src_active} (run Build first)")
-
-    # Clean old active so removed mods don't linger
-    if dest_active.exists():
-        shutil.rmtree(dest_active)
-    dest_active.mkdir(parents=True, exist_ok=True)
-
-    file_count = _copy_tree_merge(src_active, dest_active)
-
-    receipt = {
-        "folder_name": folder_name,
-        "backend": backend,
-        "safe_root": str(safe_root),
-        "dest_active": str(dest_active),
-        "enabled_mods": [m.replace("\\", "/") for m in enabled_mods],
-        "source_active": str(src_active),
-        "file_count": file_count,
-    }
-    receipt_path = (safe_root / "receipt.json").resolve()
-    receipt_path.write_text(json.dumps(receipt, indent=2), encoding="utf-8")
-
-    return DeployResult(
-        safe_root=safe_root,
-        dest_active=dest_active,
-        receipt_path=receipt_path,
-        file_count=file_count,
-        backend=backend,
-    )
-
-
-def restore_endfield_modsafe(game_exe: str, folder_name: str = "EndfieldModSafe") -> bool:
-    """
-    Removes <folder_name>/active from the backend root if present.
-    Returns True if something was removed.
-    """
-    backend, safe_root, dest_active = get_modsafe_paths(game_exe, folder_name)
-    removed = False
-
-    if dest_active.exists():
-        shutil.rmtree(dest_active)
-        removed = True
-
-    # Optional: keep safe_root for receipt/history; remove if empty
-    try:
-        if safe_root.exists() and not any(safe_root.iterdir()):
-            safe_root.rmdir()
-    except Exception:
-        pass
-
-    return removed
-
-
-# =========================================================
-# Existing conflict detection (ModSafe/_active style)
-# =========================================================
-
-def _list_manifest_copy_paths(mod_folder: Path) -> List[str]:
-    """
-    Legacy: Reads manifest.json 'copy' list, returns normalized relative destinations.
-    If no manifest or no 'copy', returns [].
-    """
-    manifest = mod_folder / "manifest.json"
-    if not manifest.exists():
-        return []
-    data = _read_json(manifest)
-    copy_list = data.get("copy") or []
-    out: List[str] = []
-    for item in copy_list:
-        if not isinstance(item, str):
-            continue
-        norm = item.replace("\\", "/").lstrip("/")
-        if norm:
-            out.append(norm)
-    return out
-
-
-def detect_enabled_path_conflicts(mods_root: Path, enabled_mods: List[str]) -> List[dict]:
-    """
-    Conflict detector (ModSafe style):
-    - Uses manifest.json 'copy' entries IF they exist.
-    If your mods don't use manifests, this won't block you.
-    """
-    writers: Dict[str, List[str]] = {}
-
-    for rel in enabled_mods:
-        rel_norm = rel.replace("\\", "/").strip("/")
-        mod_folder = (mods_root / rel_norm).resolve()
-        if not mod_folder.exists():
-            continue
-
-        copy_entries = _list_manifest_copy_paths(mod_folder)
-        if not copy_entries:
-            continue
-
-        for entry in copy_entries:
-            src = mod_folder / entry
-            dest_base = Path(rel_norm) / entry
-
-            if src.exists() and src.is_dir():
-                for f in src.rglob("*"):
-                    if f.is_file():
-                        sub = f.relative_to(mod_folder)
-                        key = str(sub).replace("\\", "/")
-                        writers.setdefault(key, []).append(rel_norm)
-            else:
-                key = str(dest_base).replace("\\", "/")
-                writers.setdefault(key, []).append(rel_norm)
-
-    conflicts = []
-    for path, mods in writers.items():
-        uniq = sorted(set(mods))
-        if len(uniq) > 1:
-            conflicts.append({"path": path, "mods": uniq})
-
-    conflicts.sort(key=lambda x: x["path"])
-    return conflicts
-
-
-# =========================================================
-# NEW: 3DMigoto folder-mod deploy (NO manifest.json)
-# =========================================================
-
-def _looks_like_migoto_mod_folder(mod_dir: Path) -> bool:
-    """
-    True if folder contains typical 3DMigoto structure:
-      - Buffer/ or Texture/ folder
-      - or any .buf/.dds files anywhere
-      - or a d3dx.ini
-    """
-    if (mod_dir / "Buffer").exists() or (mod_dir / "Texture").exists():
-        return True
-    if (mod_dir / "d3dx.ini").exists():
-        return True
-    for p in mod_dir.rglob("*"):
-        if p.is_file():
-            s = p.name.lower()
-            if s.endswith(".buf") or s.endswith(".dds"):
-                return True
-    return False
-
-
-def deploy_3dmigoto_folder_mods(
-    mods_root: Path,
-    enabled_mods: List[str],
-    game_exe: str,
-    log_fn: Callable[[str], None],
-) -> int:
-    """
-    Copies enabled 3DMigoto folder-mods to:
-      <game_root>/Mods/<ModName>/...
-
-    NO manifest required.
-    Returns number of files copied.
-    """
-    game_root = Path(game_exe).resolve().parent
-    mods_out = game_root / "Mods"
-    mods_out.mkdir(parents=True, exist_ok=True)
-
-    deployed = 0
-    total_files = 0
-
-    for rel in enabled_mods:
-        rel_norm = rel.replace("\\", "/").strip("/")
-        src_mod_dir = (mods_root / rel_norm).resolve()
-        if not src_mod_dir.exists():
-            continue
-
-        if not _looks_like_migoto_mod_folder(src_mod_dir):
-            continue
-
-        mod_name = src_mod_dir.name
-        dst_mod_dir = (mods_out / mod_name).resolve()
-
-        if dst_mod_dir.exists():
-            shutil.rmtree(dst_mod_dir, ignore_errors=True)
-        dst_mod_dir.mkdir(parents=True, exist_ok=True)
-
-        shutil.copytree(src_mod_dir, dst_mod_dir, dirs_exist_ok=True)
-        n = sum(1 for p in dst_mod_dir.rglob("*") if p.is_file())
-
-        deployed += 1
-        total_files += n
-        log_fn(f"[3DMigoto] Folder mod deployed: {mod_name} ({n} files) -> {dst_mod_dir}")
-
-    if deployed == 0:
-        log_fn("[3DMigoto] No folder-style mods detected (Buffer/Texture/.buf/.dds/d3dx.ini).")
-    else:
-        log_fn(f"[3DMigoto] Total: {deployed} mod(s), {total_files} files -> {mods_out}")
-
-    return total_files
-
-
-# =========================================================
-# NEW: Unity asset replacement deploy + receipt restore (NO manifest.json)
-# =========================================================
-
-LogFn = Callable[[str], None]
-
-ASSET_RECEIPT_DIRNAME = "deploy"          # project_root/deploy
-ASSET_RECEIPT_NAME = "receipt.json"       # project_root/deploy/receipt.json
-ASSET_BACKUP_DIRNAME = "backup"           # project_root/deploy/backup/...
-
-_ALLOWED_ASSET_ROOTS = (
-    "Endfield_Data/",
-    "resources/",
-    "game_files/",
-    "translations/",
-    "plugins/",
-)
-
-
-def _project_deploy_dir(project_root: Path) -> Path:
-    return (project_root / ASSET_RECEIPT_DIRNAME).resolve()
-
-
-def _load_asset_receipt(deploy_dir: Path) -> dict:
-    deploy_dir.mkdir(parents=True, exist_ok=True)
-    p = deploy_dir / ASSET_RECEIPT_NAME
-    if not p.exists():
-        return {"files": {}}
-    try:
-        data = _read_json(p)
-        if not isinstance(data, dict):
-            return {"files": {}}
-        data.setdefault("files", {})
-        if not isinstance(data["files"], dict):
-            data["files"] = {}
-        return data
-    except Exception:
-        return {"files": {}}
-
-
-def _save_asset_receipt(deploy_dir: Path, data: dict) -> None:
-    deploy_dir.mkdir(parents=True, exist_ok=True)
-    p = deploy_dir / ASSET_RECEIPT_NAME
-    p.write_text(json.dumps(data, indent=2), encoding="utf-8")
-
-
-def _is_allowed_asset_relpath(rel_game_path: str) -> bool:
-    rel_game_path = rel_game_path.replace("\\", "/").lstrip("/")
-    return any(rel_game_path.startswith(root) for root in _ALLOWED_ASSET_ROOTS)
-
-
-def _backup_original_once(
-    game_root: Path,
-    deploy_dir: Path,
-    rel_game_path: str,
-    log_fn: Optional[LogFn] = None,
-) -> Optional[str]:
-    rel_game_path = rel_game_path.replace("\\", "/").lstrip("/")
-    src = game_root / rel_game_path
-    if not src.exists():
-        return None
-
-    backup_rel = f"{ASSET_BACKUP_DIRNAME}/{rel_game_path}"
-    backup_abs = deploy_dir / backup_rel
-    if backup_abs.exists():
-        return backup_rel
-
-    backup_abs.parent.mkdir(parents=True, exist_ok=True)
-    if src.is_dir():
-        shutil.copytree(src, backup_abs, dirs_exist_ok=True)
-    else:
-        shutil.copy2(src, backup_abs)
-
-    if log_fn:
-        log_fn(f"[Backup] Saved original -> {backup_abs}")
-    return backup_rel
-
-
-def deploy_assets_with_receipt(
-    project_root: Path,
-    mods_root: Path,
-    enabled_mods: List[str],
-    game_exe: str,
-    log_fn: LogFn,
-) -> int:
-    game_root = Path(game_exe).resolve().parent
-    deploy_dir = _project_deploy_dir(project_root)
-
-    receipt = _load_asset_receipt(deploy_dir)
-    files_map: Dict[str, dict] = receipt.setdefault("files", {})
-
-    copied_total = 0
-    deployed_mods = 0
-
-    for rel in enabled_mods:
-        rel_norm = rel.replace("\\", "/").strip("/")
-        mod_dir = (mods_root / rel_norm).resolve()
-        if not mod_dir.exists():
-            continue
-
-        files = []
-        for p in mod_dir.rglob("*"):
-            if not p.is_file():
-                continue
-            rel_game_path = str(p.relative_to(mod_dir)).replace("\\", "/")
-            if _is_allowed_asset_relpath(rel_game_path):
-                files.append((p, rel_game_path))
-
-        if not files:
-            continue
-
-        copied_this = 0
-        for src, rel_game_path in files:
-            dst = (game_root / rel_game_path).resolve()
-
-            backup_rel = _backup_original_once(game_root, deploy_dir, rel_game_path, log_fn=log_fn)
-
-            entry = files_map.get(rel_game_path) or {}
-            entry["backup"] = backup_rel if backup_rel else entry.get("backup", None)
-
-            mods_list = entry.get("mods") or []
-            if isinstance(mods_list, str):
-                mods_list = [mods_list]
-            if rel_norm not in mods_list:
-                mods_list.append(rel_norm)
-            entry["mods"] = mods_list
-
-            files_map[rel_game_path] = entry
-
-            dst.parent.mkdir(parents=True, exist_ok=True)
-            shutil.copy2(src, dst)
-            copied_total += 1
-            copied_this += 1
-            log_fn(f"[Assets] Deployed file: {rel_game_path}")
-
-        deployed_mods += 1
-        log_fn(f"[Assets] Mod applied: {rel_norm} ({copied_this} file(s))")
-
-    _save_asset_receipt(deploy_dir, receipt)
-
-    if deployed_mods == 0:
-        log_fn("[Assets] No asset files deployed (must be under Endfield_Data/resources/game_files/etc).")
-    else:
-        log_fn(f"[Assets] Total deployed: {deployed_mods} mod(s), {copied_total} file(s)")
-
-    return copied_total
-
-
-def restore_assets_with_receipt(
-    project_root: Path,
-    game_exe: str,
-    log_fn: LogFn,
-    clear_receipt: bool = True,
-) -> int:
-    game_root = Path(game_exe).resolve().parent
-    deploy_dir = _project_deploy_dir(project_root)
-
-    receipt = _load_asset_receipt(deploy_dir)
-    files_map: Dict[str, dict] = receipt.get("files", {}) if isinstance(receipt, dict) else {}
-    if not files_map:
-        log_fn("[Restore] Nothing to restore (asset receipt is empty).")
-        return 0
-
-    restored = 0
-
-    for rel_game_path, entry in list(files_map.items()):
-        rel_game_path = str(rel_game_path).replace("\\", "/").lstrip("/")
-        dst = game_root / rel_game_path
-
-        backup_rel = entry.get("backup") if isinstance(entry, dict) else None
-
-        if backup_rel:
-            backup_abs = deploy_dir / str(backup_rel)
-            if backup_abs.exists():
-                dst.parent.mkdir(parents=True, exist_ok=True)
-                if backup_abs.is_dir():
-                    if dst.exists():
-                        shutil.rmtree(dst, ignore_errors=True)
-                    shutil.copytree(backup_abs, dst, dirs_exist_ok=True)
-                else:
-                    shutil.copy2(backup_abs, dst)
-                restored += 1
-                log_fn(f"[Restore] Restored: {rel_game_path}")
-            else:
-                log_fn(f"[Restore] Missing backup (skipped): {rel_game_path}")
-        else:
-            if dst.exists():
-                try:
-                    if dst.is_dir():
-                        shutil.rmtree(dst, ignore_errors=True)
-                    else:
-                        dst.unlink()
-                    restored += 1
-                    log_fn(f"[Restore] Removed created: {rel_game_path}")
-                except Exception as e:
-                    log_fn(f"[Restore] Failed to remove {rel_game_path}: {e}")
-
-    if clear_receipt:
-        _save_asset_receipt(deploy_dir, {"files": {}})
-        log_fn("[Restore] Asset receipt cleared.")
-
-    log_fn(f"[Restore] Done. Restored/removed: {restored} item(s).")
-    return restored
-
-
-def detect_enabled_asset_conflicts(mods_root: Path, enabled_mods: List[str]) -> List[dict]:
-    writers: Dict[str, List[str]] = {}
-
-    for rel in enabled_mods:
-        rel_norm = rel.replace("\\", "/").strip("/")
-        mod_dir = (mods_root / rel_norm).resolve()
-        if not mod_dir.exists():
-            continue
-
-        for p in mod_dir.rglob("*"):
-            if not p.is_file():
-                continue
-            rel_game_path = str(p.relative_to(mod_dir)).replace("\\", "/")
-            if not _is_allowed_asset_relpath(rel_game_path):
-                continue
-            writers.setdefault(rel_game_path, []).append(rel_norm)
-
-    conflicts = []
-    for path, mods in writers.items():
-        uniq = sorted(set(mods))
-        if len(uniq) > 1:
-            conflicts.append({"path": path, "mods": uniq})
-
-    conflicts.sort(key=lambda x: x["path"])
-    return conflicts
-
-
-# =========================================================
-# Compatibility aliases (OPTION B)
-# =========================================================
-
-def deploy_assets_no_manifest(
-    project_root: Path,
-    mods_root: Path,
-    enabled_mods: List[str],
-    game_exe: str,
-    log_fn,
-) -> int:
-    return deploy_assets_with_receipt(
-        project_root=project_root,
-        mods_root=mods_root,
-        enabled_mods=enabled_mods,
-        game_exe=game_exe,
-        log_fn=log_fn,
-    )
-
-
-def restore_assets_no_manifest(
-    project_root: Path,
-    game_exe: str,
-    log_fn,
-    clear_receipt: bool = True,
-) -> int:
-    return restore_assets_with_receipt(
-        project_root=project_root,
-        game_exe=game_exe,
-        log_fn=log_fn,
-        clear_receipt=clear_receipt,
-    )
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path  # ✅ FIX: Path is defined now
+from typing import Callable, Dict, List, Optional, Tuple
+
+from launcher.core.jsonio import dumps_indented, read_json_fast, read_manifest
+
+# Copies are I/O-bound and the GIL is released inside the kernel file
+# syscalls, so we can go well past the CPU count.
+_MAX_COPY_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+# Name of the build-state sidecar active_pack keeps inside _active.
+# Defined here (not in active_pack, which imports from this module) so
+# the deploy walk can leave it out of the game tree.
+_ACTIVE_STATE_NAME = ".manifest"
+
+
+def _norm_rel(s: str) -> str:
+    """
+    One-pass normalization for mod-relative paths: backslashes to
+    forward slashes, surrounding whitespace and slashes stripped. The
+    result is interned — the same rel paths recur across presets,
+    conflict scans and deploys, so repeats share one str object.
+    """
+    return sys.intern(s.replace("\\", "/").strip().strip("/"))
+
+
+# =========================================================
+# Existing ModSafe deploy (VFS / StreamingAssets)
+# =========================================================
+
+@dataclass
+class DeployResult:
+    safe_root: Path          # .../Endfield_Data/Persistent/VFS/EndfieldModSafe
+    dest_active: Path        # .../Endfield_Data/Persistent/VFS/EndfieldModSafe/active
+    receipt_path: Path       # .../Endfield_Data/Persistent/VFS/EndfieldModSafe/receipt.json
+    file_count: int
+    backend: str             # "vfs" or "streamingassets"
+
+
+def _scandir_walk(root: Path | str):
+    """
+    Recursive os.scandir walk yielding (DirEntry, rel_posix) for every
+    file under root. DirEntry caches the entry type from the directory
+    read, so is_file()/is_dir() don't issue a fresh stat per entry the
+    way pathlib's rglob does.
+    """
+    stack: List[Tuple[str, str]] = [(str(root), "")]
+    while stack:
+        dir_path, prefix = stack.pop()
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append((entry.path, f"{prefix}{entry.name}/"))
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry, f"{prefix}{entry.name}"
+        except OSError:
+            continue
+
+
+def _read_json(path: Path) -> dict:
+    data = read_json_fast(path)
+    return data if isinstance(data, dict) else {}
+
+
+def _fast_copytree(src: Path, dst: Path) -> Optional[int]:
+    """
+    Copy src -> dst (recursive, merge, overwrite) using the fastest tool
+    available instead of shutil's per-file Python loop:
+      - Windows: robocopy (multi-threaded; exit codes 0-7 are success)
+      - POSIX: cp -a (one process for the whole tree)
+      - Fallback: shutil.copytree
+    Returns the number of files in the tree when the tool reports it
+    (robocopy's job summary), else None.
+    """
+    dst.mkdir(parents=True, exist_ok=True)
+
+    if sys.platform == "win32" and shutil.which("robocopy"):
+        proc = subprocess.run(
+            [
+                "robocopy", str(src), str(dst),
+                "/E", "/MT:16", "/NFL", "/NDL", "/NJH", "/NP",
+                "/R:1", "/W:1",
+            ],
+            capture_output=True,
+            text=True,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        )
+        # robocopy exit codes are a bitfield; 0-7 mean success
+        if proc.returncode < 8:
+            # Job summary row: "Files :   <total>  <copied>  <skipped> ..."
+            for line in proc.stdout.splitlines():
+                line = line.strip()
+                if line.startswith("Files :"):
+                    try:
+                        return int(line.split(":", 1)[1].split()[0])
+                    except (IndexError, ValueError):
+                        break
+            return None
+    elif shutil.which("cp"):
+        rc = subprocess.run(["cp", "-a", f"{src}/.", str(dst)]).returncode
+        if rc == 0:
+            return None
+
+    shutil.copytree(src, dst, dirs_exist_ok=True)
+    return None
+
+
+def _fast_rmtree(path: Path, ignore_errors: bool = False) -> None:
+    """
+    Remove a directory tree through the platform's native deleter instead
+    of shutil.rmtree's one-syscall-per-inode Python loop:
+      - Windows: cmd /c rd /s /q
+      - POSIX: rm -rf
+      - Fallback: shutil.rmtree
+    Missing paths are a no-op either way.
+    """
+    if not os.path.lexists(path):
+        return
+    try:
+        if sys.platform == "win32":
+            subprocess.run(
+                ["cmd", "/c", "rd", "/s", "/q", str(path)],
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+            )
+        else:
+            subprocess.run(["rm", "-rf", str(path)])
+    except OSError:
+        pass
+    if os.path.lexists(path):
+        shutil.rmtree(path, ignore_errors=ignore_errors)
+
+
+def _copytree_counting(src: Path, dst: Path) -> int:
+    """
+    _fast_copytree plus a reliable file count: when the copy tool doesn't
+    report one, count the *source* in a single scandir sweep (its dirents
+    are still hot in cache from the copy) instead of re-walking dst.
+    """
+    n = _fast_copytree(src, dst)
+    if n is None:
+        n = sum(1 for _ in _scandir_walk(src))
+    return n
+
+
+def _make_parents(dsts) -> None:
+    """
+    mkdir each unique destination parent exactly once, shortest first.
+    The copy loops fan thousands of files into a handful of directories,
+    so a per-file mkdir(exist_ok=True) is almost always a wasted syscall.
+    """
+    parents = {dst.parent for dst in dsts}
+    for parent in sorted(parents, key=lambda p: len(p.parts)):
+        parent.mkdir(parents=True, exist_ok=True)
+
+
+def _crc32_file(path: str, _bufsize: int = 1 << 20) -> int:
+    """zlib.crc32 over a file (hardware-accelerated on x86)."""
+    crc = 0
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(_bufsize)
+            if not chunk:
+                break
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+def _fastcopy(src: Path, dst: Path) -> None:
+    """
+    Copy a single file through the kernel's zero-copy path where one
+    exists: CopyFileExW on Windows, copy_file_range (in-kernel,
+    reflink-capable on Btrfs/XFS) then sendfile on Linux/BSD. Falls back
+    to shutil.copy2. Metadata is preserved either way — big asset blobs
+    (textures, .ab bundles) never round-trip through Python buffers.
+    """
+    if sys.platform == "win32":
+        import ctypes
+        if ctypes.windll.kernel32.CopyFileExW(str(src), str(dst), None, None, None, 0):
+            return
+    else:
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                size = os.fstat(fsrc.fileno()).st_size
+                offset = 0
+                if hasattr(os, "copy_file_range"):
+                    while offset < size:
+                        n = os.copy_file_range(fsrc.fileno(), fdst.fileno(), size - offset)
+                        if n == 0:
+                            break
+                        offset += n
+                if offset < size and hasattr(os, "sendfile"):
+                    while offset < size:
+                        sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, size - offset)
+                        if sent == 0:
+                            break
+                        offset += sent
+                if offset < size:
+                    raise OSError("zero-copy path unavailable")
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            pass
+
+    shutil.copy2(src, dst)
+
+
+# Linux FICLONE ioctl: clone src extents into dst (reflink / CoW)
+_FICLONE = 0x40049409
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """
+    Stage a file without moving its bytes when the volume allows it:
+    hardlink first, then a Btrfs/XFS reflink, then a real _fastcopy.
+    Only for staging trees (like mods/_active) where the result is
+    read-only input to a later deploy — linked files share storage.
+    """
+    try:
+        if dst.exists():
+            dst.unlink()
+        os.link(src, dst)
+        return
+    except OSError:
+        pass
+
+    if sys.platform == "linux":
+        try:
+            import fcntl
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            try:
+                dst.unlink()
+            except OSError:
+                pass
+
+    _fastcopy(src, dst)
+
+
+def _link_tree(src: Path, dst: Path) -> int:
+    """
+    _link_or_copy every file of src into dst. When links stick, the whole
+    tree costs metadata only — no bytes move. Returns the file count.
+    """
+    pairs = [(Path(entry.path), dst / rel) for entry, rel in _scandir_walk(src)]
+    dst.mkdir(parents=True, exist_ok=True)
+    _make_parents(d for _, d in pairs)
+    for src_file, dst_file in pairs:
+        _link_or_copy(src_file, dst_file)
+    return len(pairs)
+
+
+def _pick_backend_root(game_exe: str) -> Tuple[str, Path]:
+    """
+    Prefer Endfield_Data/Persistent/VFS if it exists,
+    otherwise fall back to Endfield_Data/StreamingAssets.
+    """
+    game_root = Path(game_exe).resolve().parent
+    endfield_data = game_root / "Endfield_Data"
+
+    vfs_root = endfield_data / "Persistent" / "VFS"
+    if vfs_root.exists():
+        return "vfs", vfs_root
+
+    sa_root = endfield_data / "StreamingAssets"
+    sa_root.mkdir(parents=True, exist_ok=True)
+    return "streamingassets", sa_root
+
+
+def get_modsafe_paths(game_exe: str, folder_name: str = "EndfieldModSafe") -> Tuple[str, Path, Path]:
+    """
+    Returns (backend, safe_root, dest_active)
+    """
+    backend, base = _pick_backend_root(game_exe)
+    safe_root = (base / folder_name).resolve()
+    dest_active = (safe_root / "active").resolve()
+    return backend, safe_root, dest_active
+
+
+def deploy_endfield_modsafe(
+    project_root: Path,
+    mods_root: Path,
+    enabled_mods: List[str],
+    game_exe: str,
+    folder_name: str = "EndfieldModSafe",
+    progress_fn: Optional[Callable[[int, int], None]] = None,
+) -> DeployResult:
+    """
+    Copies the project's built active pack into the game's *real* mount location:
+    - Prefer: Endfield_Data/Persistent/VFS/<folder_name>/active
+    - Fallback: Endfield_Data/StreamingAssets/<folder_name>/active
+
+    Assumes build_active() creates: <project>/mods/_active/...
+    """
+    backend, safe_root, dest_active = get_modsafe_paths(game_exe, folder_name)
+    safe_root.mkdir(parents=True, exist_ok=True)
+    dest_active.mkdir(parents=True, exist_ok=True)
+
+    src_active = (mods_root / "_active").resolve()
+    if not src_active.exists():
+        raise FileNotFoundError(f"Active pack not found: {src_active} (run Build first)")
+
+    receipt_path = (safe_root / "receipt.json").resolve()
+
+    # Incremental deploy: the receipt carries per-file (size, mtime_ns[, crc32])
+    # signatures from the previous deploy, so an unchanged redeploy copies
+    # nothing and a partial change copies only the delta.
+    prev_files: Dict[str, list] = {}
+    if receipt_path.exists():
+        try:
+            prev = _read_json(receipt_path)
+            if isinstance(prev.get("files"), dict):
+                prev_files = prev["files"]
+        except Exception:
+            prev_files = {}
+
+    dst_listing = {rel for _, rel in _scandir_walk(dest_active)}
+
+    files_sig: Dict[str, list] = {}
+    to_copy: List[Tuple[Path, Path]] = []
+
+    for entry, rel in _scandir_walk(src_active):
+        if rel == _ACTIVE_STATE_NAME:
+            continue  # build bookkeeping, not mod content
+        try:
+            st = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue  # vanished mid-walk (concurrent rebuild)
+        sig = [st.st_size, st.st_mtime_ns]
+        old = prev_files.get(rel)
+        have_old = rel in dst_listing and isinstance(old, list) and len(old) >= 2
+
+        same = have_old and old[0] == st.st_size and old[1] == st.st_mtime_ns
+        if not same and have_old and old[0] == st.st_size:
+            # Same size but new mtime — a CRC decides if the content
+            # actually moved. Recorded in the new signature either way,
+            # so the next deploy can compare even when the old entry
+            # predates the tiebreak.
+            crc = _crc32_file(entry.path)
+            sig.append(crc)
+            if len(old) >= 3:
+                same = old[2] == crc
+
+        if not same:
+            to_copy.append((Path(entry.path), dest_active / rel))
+        files_sig[rel] = sig
+
+    # Drop destination files whose sources are gone so removed mods don't linger
+    for rel in dst_listing - set(files_sig):
+        try:
+            (dest_active / rel).unlink()
+        except OSError:
+            pass
+
+    _make_parents(dst for _, dst in to_copy)
+
+    done = 0
+    done_lock = threading.Lock()
+    total = len(to_copy)
+
+    def _copy_one(task: Tuple[Path, Path]) -> None:
+        nonlocal done
+        src, dst = task
+        _fastcopy(src, dst)
+        if progress_fn is not None:
+            with done_lock:
+                done += 1
+                if done % 64 == 0 or done == total:
+                    progress_fn(done, total)
+
+    if total > 1:
+        with ThreadPoolExecutor(max_workers=min(_MAX_COPY_WORKERS, total)) as pool:
+            list(pool.map(_copy_one, to_copy))
+    else:
+        for task in to_copy:
+            _copy_one(task)
+
+    file_count = len(files_sig)
+
+    receipt = {
+        "folder_name": folder_name,
+        "backend": backend,
+        "safe_root": str(safe_root),
+        "dest_active": str(dest_active),
+        "enabled_mods": [_norm_rel(m) for m in enabled_mods],
+        "source_active": str(src_active),
+        "file_count": file_count,
+        "copied_count": len(to_copy),
+        "files": files_sig,
+    }
+    receipt_path.write_bytes(dumps_indented(receipt))
+
+    return DeployResult(
+        safe_root=safe_root,
+        dest_active=dest_active,
+        receipt_path=receipt_path,
+        file_count=file_count,
+        backend=backend,
+    )
+
+
+def restore_endfield_modsafe(game_exe: str, folder_name: str = "EndfieldModSafe") -> bool:
+    """
+    Removes <folder_name>/active from the backend root if present.
+    Returns True if something was removed.
+    """
+    backend, safe_root, dest_active = get_modsafe_paths(game_exe, folder_name)
+    removed = False
+
+    if dest_active.exists():
+        _fast_rmtree(dest_active)
+        removed = True
+
+    # Optional: keep safe_root for receipt/history; remove if empty
+    try:
+        if safe_root.exists() and not any(safe_root.iterdir()):
+            safe_root.rmdir()
+    except Exception:
+        pass
+
+    return removed
+
+
+# =========================================================
+# Existing conflict detection (ModSafe/_active style)
+# =========================================================
+
+# One mod folder is often walked several times per GUI action (path
+# conflicts, asset conflicts, then deploy). Cache the listing briefly so
+# a single detect-then-deploy session walks each folder once.
+_MOD_LISTING_TTL = 5.0  # seconds
+_MOD_LISTING_CACHE: Dict[str, Tuple[float, frozenset]] = {}
+
+
+def _list_mod_files(mod_dir: Path) -> frozenset:
+    """
+    All file paths under mod_dir as relative posix strings, from one
+    scandir walk. Cached for a few seconds (see above).
+    """
+    key = str(mod_dir)
+    now = time.monotonic()
+    hit = _MOD_LISTING_CACHE.get(key)
+    if hit is not None and now - hit[0] < _MOD_LISTING_TTL:
+        return hit[1]
+    listing = frozenset(rel for _, rel in _scandir_walk(mod_dir))
+    _MOD_LISTING_CACHE[key] = (now, listing)
+    return listing
+
+
+@dataclass
+class ModIndex:
+    """
+    Per-action snapshot of the enabled mods' file listings. The GUI's
+    deploy action runs conflict detection and then the deploys over the
+    same folders; building this once and passing it along means each mod
+    folder is walked a single time for the whole action.
+    """
+    mods_root: Path
+    listings: Dict[str, frozenset]  # rel_norm -> relative posix file paths
+
+    @classmethod
+    def build(cls, mods_root: Path, enabled_mods: List[str]) -> "ModIndex":
+        mods_root = Path(mods_root).resolve()
+        listings: Dict[str, frozenset] = {}
+        for rel in enabled_mods:
+            rel_norm = _norm_rel(rel)
+            if rel_norm in listings:
+                continue
+            mod_dir = mods_root / rel_norm
+            if mod_dir.exists():
+                listings[rel_norm] = _list_mod_files(mod_dir)
+        return cls(mods_root=mods_root, listings=listings)
+
+
+def _list_manifest_copy_paths(mod_folder: Path) -> List[str]:
+    """
+    Legacy: Reads manifest.json 'copy' list, returns normalized relative destinations.
+    If no manifest or no 'copy', returns [].
+    """
+    manifest = mod_folder / "manifest.json"
+    if not manifest.exists():
+        return []
+    try:
+        data = read_manifest(manifest)
+    except (OSError, ValueError):
+        return []
+    if not isinstance(data, dict):
+        return []
+    copy_list = data.get("copy") or []
+    out: List[str] = []
+    for item in copy_list:
+        if not isinstance(item, str):
+            continue
+        norm = item.replace("\\", "/").lstrip("/")
+        if norm:
+            out.append(norm)
+    return out
+
+
+def detect_enabled_path_conflicts(mods_root: Path, enabled_mods: List[str]) -> List[dict]:
+    """
+    Conflict detector (ModSafe style):
+    - Uses manifest.json 'copy' entries IF they exist.
+    If your mods don't use manifests, this won't block you.
+    """
+    writers: Dict[str, List[str]] = {}
+    mods_root = mods_root.resolve()
+
+    for rel in enabled_mods:
+        rel_norm = _norm_rel(rel)
+        mod_folder = mods_root / rel_norm
+        if not mod_folder.exists():
+            continue
+
+        copy_entries = _list_manifest_copy_paths(mod_folder)
+        if not copy_entries:
+            continue
+
+        # One cached walk per mod; manifest entries intersect the listing
+        # by string prefix instead of re-walking each subtree.
+        listing = _list_mod_files(mod_folder)
+
+        for entry in copy_entries:
+            prefix = f"{entry}/"
+            matched = False
+            for key in listing:
+                if key.startswith(prefix):
+                    writers.setdefault(key, []).append(rel_norm)
+                    matched = True
+            if not matched:
+                key = f"{rel_norm}/{entry}"
+                writers.setdefault(key, []).append(rel_norm)
+
+    conflicts = []
+    for path, mods in writers.items():
+        uniq = sorted(set(mods))
+        if len(uniq) > 1:
+            conflicts.append({"path": path, "mods": uniq})
+
+    conflicts.sort(key=lambda x: x["path"])
+    return conflicts
+
+
+# =========================================================
+# NEW: 3DMigoto folder-mod deploy (NO manifest.json)
+# =========================================================
+
+def _looks_like_migoto_mod_folder(mod_dir: Path, listing: Optional[frozenset] = None) -> bool:
+    """
+    True if folder contains typical 3DMigoto structure:
+      - Buffer/ or Texture/ folder
+      - or any .buf/.dds files anywhere
+      - or a d3dx.ini
+    An already-built listing (see ModIndex) skips the suffix walk.
+    """
+    if (mod_dir / "Buffer").exists() or (mod_dir / "Texture").exists():
+        return True
+    if (mod_dir / "d3dx.ini").exists():
+        return True
+    if listing is not None:
+        return any(f.lower().endswith((".buf", ".dds")) for f in listing)
+    for entry, _ in _scandir_walk(mod_dir):
+        name = entry.name.lower()
+        if name.endswith(".buf") or name.endswith(".dds"):
+            return True
+    return False
+
+
+def deploy_3dmigoto_folder_mods(
+    mods_root: Path,
+    enabled_mods: List[str],
+    game_exe: str,
+    log_fn: Callable[[str], None],
+    index: Optional[ModIndex] = None,
+) -> int:
+    """
+    Copies enabled 3DMigoto folder-mods to:
+      <game_root>/Mods/<ModName>/...
+
+    NO manifest required.
+    Returns number of files copied.
+    """
+    game_root = Path(game_exe).resolve().parent
+    mods_root = mods_root.resolve()
+    mods_out = game_root / "Mods"
+    mods_out.mkdir(parents=True, exist_ok=True)
+
+    deployed = 0
+    total_files = 0
+
+    for rel in enabled_mods:
+        rel_norm = _norm_rel(rel)
+        src_mod_dir = mods_root / rel_norm
+        if not src_mod_dir.exists():
+            continue
+
+        listing = index.listings.get(rel_norm) if index is not None else None
+        if not _looks_like_migoto_mod_folder(src_mod_dir, listing):
+            continue
+
+        mod_name = src_mod_dir.name
+        dst_mod_dir = mods_out / mod_name
+
+        if dst_mod_dir.exists():
+            _fast_rmtree(dst_mod_dir, ignore_errors=True)
+        dst_mod_dir.mkdir(parents=True, exist_ok=True)
+
+        n = _copytree_counting(src_mod_dir, dst_mod_dir)
+
+        deployed += 1
+        total_files += n
+        log_fn(f"[3DMigoto] Folder mod deployed: {mod_name} ({n} files) -> {dst_mod_dir}")
+
+    if deployed == 0:
+        log_fn("[3DMigoto] No folder-style mods detected (Buffer/Texture/.buf/.dds/d3dx.ini).")
+    else:
+        log_fn(f"[3DMigoto] Total: {deployed} mod(s), {total_files} files -> {mods_out}")
+
+    return total_files
+
+
+# =========================================================
+# NEW: Unity asset replacement deploy + receipt restore (NO manifest.json)
+# =========================================================
+
+LogFn = Callable[[str], None]
+
+
+class BatchedLogger:
+    """
+    Buffers log lines and hands log_fn one newline-joined message every
+    100 entries or 100ms, whichever comes first. Per-file logging from
+    the copy loops otherwise means thousands of individual cross-thread
+    emissions (Qt signal per line) on a large deploy.
+    """
+
+    def __init__(self, log_fn: LogFn, max_entries: int = 100, max_age: float = 0.1):
+        self._log_fn = log_fn
+        self._max_entries = max_entries
+        self._max_age = max_age
+        self._buf: List[str] = []
+        self._first_ts = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, msg: str) -> None:
+        with self._lock:
+            if not self._buf:
+                self._first_ts = time.monotonic()
+            self._buf.append(msg)
+            full = (
+                len(self._buf) >= self._max_entries
+                or time.monotonic() - self._first_ts >= self._max_age
+            )
+            if not full:
+                return
+            lines, self._buf = self._buf, []
+        self._log_fn("\n".join(lines))
+
+    def flush(self) -> None:
+        with self._lock:
+            lines, self._buf = self._buf, []
+        if lines:
+            self._log_fn("\n".join(lines))
+
+ASSET_RECEIPT_DIRNAME = "deploy"          # project_root/deploy
+ASSET_RECEIPT_NAME = "receipt.json"       # project_root/deploy/receipt.json
+ASSET_BACKUP_DIRNAME = "backup"           # project_root/deploy/backup/...
+
+_ALLOWED_ASSET_ROOTS = (
+    "Endfield_Data/",
+    "resources/",
+    "game_files/",
+    "translations/",
+    "plugins/",
+)
+
+
+def _project_deploy_dir(project_root: Path) -> Path:
+    return (project_root / ASSET_RECEIPT_DIRNAME).resolve()
+
+
+def _load_asset_receipt(deploy_dir: Path) -> dict:
+    deploy_dir.mkdir(parents=True, exist_ok=True)
+    p = deploy_dir / ASSET_RECEIPT_NAME
+    if not p.exists():
+        return {"files": {}}
+    try:
+        data = _read_json(p)
+        if not isinstance(data, dict):
+            return {"files": {}}
+        data.setdefault("files", {})
+        if not isinstance(data["files"], dict):
+            data["files"] = {}
+        return data
+    except Exception:
+        return {"files": {}}
+
+
+def _save_asset_receipt(deploy_dir: Path, data: dict) -> None:
+    deploy_dir.mkdir(parents=True, exist_ok=True)
+    p = deploy_dir / ASSET_RECEIPT_NAME
+    p.write_bytes(dumps_indented(data))
+
+
+def _is_allowed_asset_relpath(rel_game_path: str) -> bool:
+    # Callers feed posix-normalized scandir output, so no re-normalization:
+    # str.startswith accepts the prefix tuple and runs entirely in C.
+    return rel_game_path.startswith(_ALLOWED_ASSET_ROOTS)
+
+
+def _backup_original_once(
+    game_root: Path,
+    deploy_dir: Path,
+    rel_game_path: str,
+    log_fn: Optional[LogFn] = None,
+) -> Optional[str]:
+    rel_game_path = rel_game_path.replace("\\", "/").lstrip("/")
+    src = game_root / rel_game_path
+    if not src.exists():
+        return None
+
+    backup_rel = f"{ASSET_BACKUP_DIRNAME}/{rel_game_path}"
+    backup_abs = deploy_dir / backup_rel
+    if backup_abs.exists():
+        return backup_rel
+
+    backup_abs.parent.mkdir(parents=True, exist_ok=True)
+    if src.is_dir():
+        shutil.copytree(src, backup_abs, dirs_exist_ok=True)
+    else:
+        _fastcopy(src, backup_abs)
+
+    if log_fn:
+        log_fn(f"[Backup] Saved original -> {backup_abs}")
+    return backup_rel
+
+
+def deploy_assets_with_receipt(
+    project_root: Path,
+    mods_root: Path,
+    enabled_mods: List[str],
+    game_exe: str,
+    log_fn: LogFn,
+    progress_fn: Optional[Callable[[int, int], None]] = None,
+    index: Optional[ModIndex] = None,
+) -> int:
+    # Resolve the roots once; everything below lives under them, so the
+    # per-iteration paths don't need their own lstat-per-component resolve.
+    game_root = Path(game_exe).resolve().parent
+    mods_root = mods_root.resolve()
+    deploy_dir = _project_deploy_dir(project_root)
+
+    receipt = _load_asset_receipt(deploy_dir)
+    files_map: Dict[str, dict] = receipt.setdefault("files", {})
+
+    # Per-file lines go through a batcher; summaries still log directly.
+    blog = BatchedLogger(log_fn)
+
+    # Phase 1 (serial): walk mods, update receipt bookkeeping, collect copy tasks
+    tasks: List[Tuple[Path, Path, str]] = []  # (src, dst, rel_game_path)
+    per_mod_counts: List[Tuple[str, int]] = []
+
+    for rel in enabled_mods:
+        rel_norm = _norm_rel(rel)
+        mod_dir = mods_root / rel_norm
+        if not mod_dir.exists():
+            continue
+
+        if index is not None:
+            listing = index.listings.get(rel_norm)
+            if listing is None:
+                # Mod appeared after the index was built — skip it here,
+                # same as detect_enabled_asset_conflicts; the next
+                # deploy's fresh index will pick it up.
+                continue
+        else:
+            listing = _list_mod_files(mod_dir)
+
+        files = []
+        for rel_game_path in listing:
+            if _is_allowed_asset_relpath(rel_game_path):
+                files.append((mod_dir / rel_game_path, rel_game_path))
+
+        if not files:
+            continue
+
+        for src, rel_game_path in files:
+            dst = game_root / rel_game_path
+
+            backup_rel = _backup_original_once(game_root, deploy_dir, rel_game_path, log_fn=blog.add)
+
+            entry = files_map.get(rel_game_path) or {}
+            entry["backup"] = backup_rel if backup_rel else entry.get("backup", None)
+
+            mods_list = entry.get("mods") or []
+            if isinstance(mods_list, str):
+                mods_list = [mods_list]
+            if rel_norm not in set(mods_list):
+                mods_list.append(rel_norm)
+            entry["mods"] = mods_list
+
+            files_map[rel_game_path] = entry
+            tasks.append((src, dst, rel_game_path))
+
+        per_mod_counts.append((rel_norm, len(files)))
+
+    # Phase 2 (parallel): the copies are independent, so fan them out
+    _make_parents(dst for _, dst, _ in tasks)
+
+    done = 0
+    done_lock = threading.Lock()
+    total = len(tasks)
+
+    def _copy_one(task: Tuple[Path, Path, str]) -> None:
+        nonlocal done
+        src, dst, _ = task
+        _fastcopy(src, dst)
+        if progress_fn is not None:
+            with done_lock:
+                done += 1
+                if done % 64 == 0 or done == total:
+                    progress_fn(done, total)
+
+    if tasks:
+        workers = min(_MAX_COPY_WORKERS, len(tasks))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(_copy_one, tasks))
+        else:
+            for task in tasks:
+                _copy_one(task)
+
+        for _, _, rel_game_path in tasks:
+            blog.add(f"[Assets] Deployed file: {rel_game_path}")
+
+    copied_total = len(tasks)
+    deployed_mods = len(per_mod_counts)
+    for rel_norm, n in per_mod_counts:
+        blog.add(f"[Assets] Mod applied: {rel_norm} ({n} file(s))")
+    blog.flush()
+
+    _save_asset_receipt(deploy_dir, receipt)
+
+    if deployed_mods == 0:
+        log_fn("[Assets] No asset files deployed (must be under Endfield_Data/resources/game_files/etc).")
+    else:
+        log_fn(f"[Assets] Total deployed: {deployed_mods} mod(s), {copied_total} file(s)")
+
+    return copied_total
+
+
+def restore_assets_with_receipt(
+    project_root: Path,
+    game_exe: str,
+    log_fn: LogFn,
+    clear_receipt: bool = True,
+) -> int:
+    game_root = Path(game_exe).resolve().parent
+    deploy_dir = _project_deploy_dir(project_root)
+
+    receipt = _load_asset_receipt(deploy_dir)
+    files_map: Dict[str, dict] = receipt.get("files", {}) if isinstance(receipt, dict) else {}
+    if not files_map:
+        log_fn("[Restore] Nothing to restore (asset receipt is empty).")
+        return 0
+
+    restored = 0
+
+    for rel_game_path, entry in list(files_map.items()):
+        rel_game_path = str(rel_game_path).replace("\\", "/").lstrip("/")
+        dst = game_root / rel_game_path
+
+        backup_rel = entry.get("backup") if isinstance(entry, dict) else None
+
+        if backup_rel:
+            backup_abs = deploy_dir / str(backup_rel)
+            if backup_abs.exists():
+                dst.parent.mkdir(parents=True, exist_ok=True)
+                if backup_abs.is_dir():
+                    if dst.exists():
+                        _fast_rmtree(dst, ignore_errors=True)
+                    shutil.copytree(backup_abs, dst, dirs_exist_ok=True)
+                else:
+                    shutil.copy2(backup_abs, dst)
+                restored += 1
+                log_fn(f"[Restore] Restored: {rel_game_path}")
+            else:
+                log_fn(f"[Restore] Missing backup (skipped): {rel_game_path}")
+        else:
+            if dst.exists():
+                try:
+                    if dst.is_dir():
+                        _fast_rmtree(dst, ignore_errors=True)
+                    else:
+                        dst.unlink()
+                    restored += 1
+                    log_fn(f"[Restore] Removed created: {rel_game_path}")
+                except Exception as e:
+                    log_fn(f"[Restore] Failed to remove {rel_game_path}: {e}")
+
+    if clear_receipt:
+        _save_asset_receipt(deploy_dir, {"files": {}})
+        log_fn("[Restore] Asset receipt cleared.")
+
+    log_fn(f"[Restore] Done. Restored/removed: {restored} item(s).")
+    return restored
+
+
+def detect_enabled_asset_conflicts(
+    mods_root: Path,
+    enabled_mods: List[str],
+    index: Optional[ModIndex] = None,
+) -> List[dict]:
+    writers: Dict[str, List[str]] = {}
+    mods_root = mods_root.resolve()
+
+    for rel in enabled_mods:
+        rel_norm = _norm_rel(rel)
+        mod_dir = mods_root / rel_norm
+        if index is not None:
+            listing = index.listings.get(rel_norm)
+            if listing is None:
+                continue
+        elif mod_dir.exists():
+            listing = _list_mod_files(mod_dir)
+        else:
+            continue
+
+        for rel_game_path in listing:
+            if not _is_allowed_asset_relpath(rel_game_path):
+                continue
+            writers.setdefault(rel_game_path, []).append(rel_norm)
+
+    conflicts = []
+    for path, mods in writers.items():
+        uniq = sorted(set(mods))
+        if len(uniq) > 1:
+            conflicts.append({"path": path, "mods": uniq})
+
+    conflicts.sort(key=lambda x: x["path"])
+    return conflicts
+
+
+# =========================================================
+# Compatibility aliases (OPTION B)
+# =========================================================
+
+def deploy_assets_no_manifest(
+    project_root: Path,
+    mods_root: Path,
+    enabled_mods: List[str],
+    game_exe: str,
+    log_fn,
+    progress_fn: Optional[Callable[[int, int], None]] = None,
+    index: Optional[ModIndex] = None,
+) -> int:
+    return deploy_assets_with_receipt(
+        project_root=project_root,
+        mods_root=mods_root,
+        enabled_mods=enabled_mods,
+        game_exe=game_exe,
+        log_fn=log_fn,
+        progress_fn=progress_fn,
+        index=index,
+    )
+
+
+def restore_assets_no_manifest(
+    project_root: Path,
+    game_exe: str,
+    log_fn,
+    clear_receipt: bool = True,
+) -> int:
+    return restore_assets_with_receipt(
+        project_root=project_root,
+        game_exe=game_exe,
+        log_fn=log_fn,
+        clear_receipt=clear_receipt,
+    )
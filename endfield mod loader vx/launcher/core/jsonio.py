@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import functools
+import json
+import os
+from pathlib import Path
+
+try:
+    import orjson  # optional: native parser/serializer, ~5x stdlib json
+except ImportError:
+    orjson = None
+
+_BOM = b"\xef\xbb\xbf"
+
+
+def read_json_fast(path: Path):
+    """
+    Load JSON without the utf-8-sig decode pass: read the raw bytes,
+    slice off a UTF-8 BOM if present, and feed the bytes straight to the
+    parser (CPython's json handles UTF-8 bytes natively, so no str copy
+    is materialized). Returns {} for an empty file.
+    """
+    data = path.read_bytes()
+    if data.startswith(_BOM):
+        data = data[3:]
+    data = data.strip()
+    if not data:
+        return {}
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_indented(obj) -> bytes:
+    """
+    Serialize to pretty-printed UTF-8 bytes. Multi-MB receipts serialize
+    several times faster through orjson than stdlib json.dumps + encode.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    # ensure_ascii=False matches orjson's UTF-8 output, so config files
+    # look the same whichever serializer produced them.
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def write_bytes_atomic(path: Path, data: bytes) -> None:
+    """
+    Write via a sibling temp file + os.replace so readers never see a
+    half-written file — a crash mid-write leaves the old content intact.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+@functools.lru_cache(maxsize=None)
+def _manifest_cached(path_str: str, mtime_ns: int):
+    return read_json_fast(Path(path_str))
+
+
+def read_manifest(path: Path):
+    """
+    read_json_fast with memoization keyed on (path, mtime_ns): a single
+    build+detect+deploy action parses each manifest.json several times,
+    and the cache collapses those to one read. Editing the file bumps
+    the mtime and invalidates automatically. Treat the result as
+    read-only — it is shared between callers.
+    """
+    st = path.stat()
+    return _manifest_cached(str(path), st.st_mtime_ns)
@@ -1,219 +1,576 @@
-from __future__ import annotations
-
-from dataclasses import dataclass, field
-from pathlib import Path
-from typing import List
-
-
-@dataclass
-class ModInfo:
-    name: str
-    rel_path: str
-    mod_type: str  # "config", "asset", "migoto", "folder"
-    version: str = ""
-    author: str = ""
-    description: str = ""
-    errors: List[str] = field(default_factory=list)
-    warnings: List[str] = field(default_factory=list)
-
-
-# These are "category" folders directly under mods/
-CATEGORY_FOLDERS = {"misc", "skins", "configs", "assets", "folders"}
-
-# These are NOT mods — they are common internal subfolders of a mod
-# If the scanner sees these, it must NOT list them as separate mods.
-NOT_A_MOD_FOLDER_NAMES = {
-    "texture", "textures",
-    "buffer", "buffers",
-    "shader", "shaders",
-    "output", "outputs",
-    "cache", "caches",
-    "override", "overrides",
-    "resources", "resource",
-    "__pycache__",
-}
-
-_ALLOWED_ASSET_ROOTS = ("Endfield_Data", "resources", "game_files", "translations", "plugins")
-
-
-def _has_any_suffix(root: Path, suffixes: tuple[str, ...]) -> bool:
-    for p in root.rglob("*"):
-        if p.is_file() and p.name.lower().endswith(suffixes):
-            return True
-    return False
-
-
-def _looks_like_migoto_mod_folder(mod_dir: Path) -> bool:
-    # Migoto marker folders/files at THIS LEVEL
-    if (mod_dir / "Texture").exists() or (mod_dir / "texture").exists():
-        return True
-    if (mod_dir / "Buffer").exists() or (mod_dir / "buffer").exists():
-        return True
-    if (mod_dir / "d3dx.ini").exists():
-        return True
-    # Or any .dds/.buf inside (common for packed folders)
-    return _has_any_suffix(mod_dir, (".dds", ".buf"))
-
-
-def _looks_like_asset_mod_folder(mod_dir: Path) -> bool:
-    for root in _ALLOWED_ASSET_ROOTS:
-        if (mod_dir / root).exists():
-            return True
-    return False
-
-
-def _looks_like_config_mod_folder(mod_dir: Path) -> bool:
-    # Loose heuristic
-    return _has_any_suffix(mod_dir, (".ini", ".cfg", ".txt", ".json"))
-
-
-def _folder_has_any_file(mod_dir: Path) -> bool:
-    for p in mod_dir.rglob("*"):
-        if p.is_file():
-            # ignore windows junk
-            if p.name.lower() in ("desktop.ini",):
-                continue
-            return True
-    return False
-
-
-def _is_container_folder(mod_dir: Path, mods_root: Path) -> bool:
-    """
-    Do not list:
-      - mods/ root
-      - top-level category folders like mods/misc, mods/skins, etc.
-    """
-    try:
-        rel = mod_dir.relative_to(mods_root)
-    except Exception:
-        return True
-
-    if rel.as_posix() in (".", ""):
-        return True
-
-    # first folder under mods/
-    if len(rel.parts) == 1:
-        return True
-
-    return False
-
-
-def _is_subfolder_that_should_not_be_listed(mod_dir: Path, mods_root: Path) -> bool:
-    """
-    Skip folders like Texture/ and Buffer/ (3DMigoto internals),
-    even though they contain files.
-    """
-    name = mod_dir.name.lower().strip()
-
-    if name in NOT_A_MOD_FOLDER_NAMES:
-        return True
-
-    # If it is exactly mods/misc or mods/skins etc, skip (container)
-    try:
-        rel = mod_dir.relative_to(mods_root)
-        if len(rel.parts) == 1 and rel.parts[0].lower() in CATEGORY_FOLDERS:
-            return True
-    except Exception:
-        pass
-
-    # If parent looks like migoto mod and this folder is Texture/Buffer -> skip
-    parent = mod_dir.parent
-    if parent.exists() and _looks_like_migoto_mod_folder(parent):
-        if name in ("texture", "buffer"):
-            return True
-
-    return False
-
-
-def _iter_real_mod_folders(mods_root: Path) -> List[Path]:
-    mods_root = mods_root.resolve()
-    if not mods_root.exists():
-        return []
-
-    deny_names = {"_active", "__pycache__", ".git"}
-    candidates: List[Path] = []
-
-    for d in mods_root.rglob("*"):
-        if not d.is_dir():
-            continue
-
-        if d.name in deny_names:
-            continue
-
-        if "_active" in {p.name for p in d.parents}:
-            continue
-
-        if _is_container_folder(d, mods_root):
-            continue
-
-        if _is_subfolder_that_should_not_be_listed(d, mods_root):
-            continue
-
-        if not _folder_has_any_file(d):
-            continue
-
-        candidates.append(d)
-
-    candidates = sorted(set(candidates), key=lambda p: (len(p.parts), str(p).lower()))
-    candidate_set = set(candidates)
-
-    final: List[Path] = []
-
-    for d in candidates:
-        # If a child dir is also a candidate, d might just be a container for multiple mods
-        has_child_candidate = False
-        for c in candidate_set:
-            if c != d and d in c.parents:
-                has_child_candidate = True
-                break
-
-        looks_like_mod = (
-            _looks_like_migoto_mod_folder(d)
-            or _looks_like_asset_mod_folder(d)
-            or _looks_like_config_mod_folder(d)
-        )
-
-        if looks_like_mod:
-            final.append(d)
-            continue
-
-        # If it doesn't look like a mod folder, keep only if leaf
-        if not has_child_candidate:
-            final.append(d)
-
-    return final
-
-
-def scan_mods(mods_root: Path) -> List[ModInfo]:
-    mods_root = Path(mods_root).resolve()
-    mods: List[ModInfo] = []
-
-    for folder in _iter_real_mod_folders(mods_root):
-        rel = folder.relative_to(mods_root)
-        rel_norm = str(rel).replace("\\", "/")
-
-        errors: List[str] = []
-        warnings: List[str] = []
-
-        if _looks_like_migoto_mod_folder(folder):
-            mod_type = "migoto"
-        elif _looks_like_asset_mod_folder(folder):
-            mod_type = "asset"
-        elif _looks_like_config_mod_folder(folder):
-            mod_type = "config"
-        else:
-            mod_type = "folder"
-
-        mods.append(
-            ModInfo(
-                name=folder.name,
-                rel_path=rel_norm,
-                mod_type=mod_type,
-                errors=errors,
-                warnings=warnings,
-            )
-        )
-
-    order = {"migoto": 0, "asset": 1, "config": 2, "folder": 3}
-    mods.sort(key=lambda m: (order.get(m.mod_type, 99), m.name.lower(), m.rel_path.lower()))
-    return mods
+from __future__ import annotations
+
+import functools
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from launcher.core.jsonio import read_manifest
+
+
+@dataclass(slots=True)
+class ModInfo:
+    name: str
+    rel_path: str
+    mod_type: str  # "config", "asset", "migoto", "folder"
+    version: str = ""
+    author: str = ""
+    description: str = ""
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    # Precomputed lowercase keys (filled by scan_mods) so sorting and
+    # filtering never re-lower the same strings per comparison.
+    name_lc: str = ""
+    rel_lc: str = ""
+    # Casefolded "name\nrel\nauthor" haystack for the search box, built
+    # once per scan instead of per model rebuild.
+    search_key: str = ""
+    # Rendered details-pane text, so selecting a row is one attribute
+    # read instead of a string build per click.
+    details_text: str = ""
+    # Rendered hover tooltip; Qt re-queries it per hover event.
+    tooltip_text: str = ""
+
+
+# These are "category" folders directly under mods/
+CATEGORY_FOLDERS = frozenset({"misc", "skins", "configs", "assets", "folders"})
+
+# These are NOT mods — they are common internal subfolders of a mod
+# If the scanner sees these, it must NOT list them as separate mods.
+NOT_A_MOD_FOLDER_NAMES = frozenset({
+    "texture", "textures",
+    "buffer", "buffers",
+    "shader", "shaders",
+    "output", "outputs",
+    "cache", "caches",
+    "override", "overrides",
+    "resources", "resource",
+    "__pycache__",
+})
+
+_ALLOWED_ASSET_ROOTS = ("Endfield_Data", "resources", "game_files", "translations", "plugins")
+
+# Pre-lowered once; the hot loops compare lowercased DirEntry names
+# against these instead of re-deriving them per entry.
+_ASSET_ROOTS_LOWER = frozenset(r.lower() for r in _ALLOWED_ASSET_ROOTS)
+_MIGOTO_SUFFIXES = (".dds", ".buf")
+_CONFIG_SUFFIXES = (".ini", ".cfg", ".txt", ".json")
+
+# Subtrees the scanner never needs to enter at all. Pruned at the walk
+# boundary (like editing os.walk's dirnames in place) so an _active pack
+# mirroring the whole tree doesn't double the scan.
+_PRUNE_DIR_NAMES = frozenset({"_active", "__pycache__", ".git"})
+
+# In-flight import/install scratch dirs: the GUI extracts archives into
+# tempfile.mkdtemp folders beside their destination so the final move is
+# an os.replace on the same volume. They must stay invisible until then,
+# or the watcher-triggered rescan lists half-extracted internals as mods.
+_SCRATCH_DIR_PREFIXES = ("endfield_mod_import_", "endfield_install_")
+
+# Every name that can make a folder skippable, compiled once. A single
+# C-level match rejects the common candidate (a real mod name) before
+# the precise per-branch tests below even run.
+_SKIP_NAME_RE = re.compile(
+    r"^(?:_active|__pycache__|\.git"
+    r"|misc|skins|configs|assets|folders"
+    r"|textures?|buffers?|shaders?|outputs?|caches?|overrides?|resources?)$",
+    re.IGNORECASE,
+)
+
+
+def _scan_tree(path: Path | str):
+    """
+    os.scandir generator yielding ("d"|"f", DirEntry) for every entry
+    under path, symlinks skipped. DirEntry carries the type from the
+    directory read itself, so consumers can call is_file()/is_dir() and
+    read .name/.path without the per-entry stat that rglob pays. The
+    walk keeps an explicit directory stack — one generator frame total
+    instead of one per tree level.
+    """
+    stack = [os.fspath(path)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_symlink():
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        yield "d", entry
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield "f", entry
+                except OSError:
+                    continue
+
+
+def _has_any_suffix(root: Path, suffixes: tuple[str, ...]) -> bool:
+    # Iterative DFS with an explicit stack: the answer is usually in the
+    # first directory, so bail on the first hit without generator frames
+    # or Path construction.
+    stack = [os.fspath(root)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        try:
+            for entry in it:
+                try:
+                    if entry.is_file(follow_symlinks=False):
+                        if entry.name.lower().endswith(suffixes):
+                            return True
+                    elif entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                except OSError:
+                    continue
+        finally:
+            it.close()
+    return False
+
+
+@functools.lru_cache(maxsize=4096)
+def _classify(path_str: str) -> tuple[bool, bool, bool]:
+    """
+    (looks_migoto, looks_asset, looks_config) for one folder, answered
+    with at most one tree walk. The scanner asks these questions several
+    times per candidate (skip tests, final filter, mod_type), so the
+    result is cached per path; scan_mods clears the cache per rescan.
+    """
+    mod_dir = Path(path_str)
+
+    # Markers at THIS LEVEL from one directory read, not a stat per
+    # spelling (Texture/texture/Buffer/buffer/d3dx.ini were five
+    # exists() calls). Matching case-insensitively mirrors the NTFS
+    # behavior the old exists() checks had on the game's home platform.
+    # The DirEntry carries the type for free, so the marker test is also
+    # type-aware: Texture/Buffer only count as dirs, d3dx.ini as a file.
+    child_names = set()
+    child_dirs = set()
+    try:
+        with os.scandir(mod_dir) as it:
+            for e in it:
+                name = e.name.lower()
+                child_names.add(name)
+                try:
+                    if e.is_dir(follow_symlinks=False):
+                        child_dirs.add(name)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+
+    looks_migoto = (
+        "texture" in child_dirs
+        or "buffer" in child_dirs
+        or ("d3dx.ini" in child_names and "d3dx.ini" not in child_dirs)
+    )
+
+    looks_asset = not _ASSET_ROOTS_LOWER.isdisjoint(child_names)
+
+    # One walk answers both suffix heuristics; it short-circuits as
+    # soon as both are settled.
+    looks_config = False
+    for kind, entry in _scan_tree(mod_dir):
+        if kind != "f":
+            continue
+        name = entry.name.lower()
+        if not looks_migoto and name.endswith(_MIGOTO_SUFFIXES):
+            looks_migoto = True
+        if not looks_config and name.endswith(_CONFIG_SUFFIXES):
+            looks_config = True
+        if looks_migoto and looks_config:
+            break
+
+    return looks_migoto, looks_asset, looks_config
+
+
+def _looks_like_migoto_mod_folder(mod_dir: Path) -> bool:
+    return _classify(os.fspath(mod_dir))[0]
+
+
+def _looks_like_asset_mod_folder(mod_dir: Path) -> bool:
+    return _classify(os.fspath(mod_dir))[1]
+
+
+def _looks_like_config_mod_folder(mod_dir: Path) -> bool:
+    # Loose heuristic
+    return _classify(os.fspath(mod_dir))[2]
+
+
+def _folder_has_any_file(mod_dir: Path) -> bool:
+    # Same explicit-stack DFS as _has_any_suffix: stop at the first real
+    # file instead of walking the rest of the subtree.
+    stack = [os.fspath(mod_dir)]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        try:
+            for entry in it:
+                try:
+                    if entry.is_file(follow_symlinks=False):
+                        # ignore windows junk
+                        if entry.name.lower() in ("desktop.ini",):
+                            continue
+                        return True
+                    elif entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                except OSError:
+                    continue
+        finally:
+            it.close()
+    return False
+
+
+def _is_subfolder_that_should_not_be_listed(
+    path: str,
+    name: str,
+    depth: int,
+    migoto_dirs: Optional[set] = None,
+) -> bool:
+    """
+    Skip folders like Texture/ and Buffer/ (3DMigoto internals),
+    even though they contain files.
+
+    path is the absolute directory string, name its (original-case)
+    basename, depth the number of components below mods/. migoto_dirs,
+    when given, is the precomputed set of migoto-looking directory paths
+    from the scan pass, so the parent test is a lookup instead of a
+    subtree walk.
+    """
+    # All skip rules below key on the folder name; one regex match
+    # short-circuits folders whose name can never trigger any of them.
+    if _SKIP_NAME_RE.match(name) is None:
+        return False
+
+    name = name.lower()
+
+    if name in NOT_A_MOD_FOLDER_NAMES:
+        return True
+
+    # If it is exactly mods/misc or mods/skins etc, skip (container)
+    if depth == 1 and name in CATEGORY_FOLDERS:
+        return True
+
+    # If parent looks like migoto mod and this folder is Texture/Buffer -> skip
+    if name in ("texture", "buffer"):
+        parent = os.path.dirname(path)
+        if migoto_dirs is not None:
+            if parent in migoto_dirs:
+                return True
+        elif os.path.isdir(parent) and _looks_like_migoto_mod_folder(parent):
+            return True
+
+    return False
+
+
+def _iter_real_mod_folders(mods_root: Path) -> List[tuple[str, str]]:
+    """Return (abs_path, rel_posix) string pairs for every real mod folder."""
+    mods_root = mods_root.resolve()
+    if not mods_root.exists():
+        return []
+
+    # Pass 1: one walk records every directory plus per-dir migoto marker
+    # metadata (Texture/Buffer child, d3dx.ini, any .dds/.buf inside), so
+    # the parent-is-migoto test below never re-walks a subtree.
+    root_str = str(mods_root)
+    dir_meta: dict = {root_str: [False, False]}  # [level_marker, dds_buf_inside]
+    seen_dirs: List[str] = []
+
+    # Top level by hand: each subdir becomes a shard that can walk on its
+    # own pool thread (scandir is I/O-bound, so shards overlap nicely on
+    # slow or network disks); files directly under mods/ feed the root meta.
+    shards: List[str] = []
+    try:
+        with os.scandir(mods_root) as it:
+            for entry in it:
+                name = entry.name.lower()
+                if entry.is_symlink():
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    if name in _PRUNE_DIR_NAMES or name.startswith(_SCRATCH_DIR_PREFIXES):
+                        continue
+                    dir_meta[entry.path] = [False, False]
+                    seen_dirs.append(entry.path)
+                    shards.append(entry.path)
+                    if name in ("texture", "buffer"):
+                        dir_meta[root_str][0] = True
+                elif entry.is_file(follow_symlinks=False):
+                    if name == "d3dx.ini":
+                        dir_meta[root_str][0] = True
+                    elif name.endswith((".dds", ".buf")):
+                        dir_meta[root_str][1] = True
+    except OSError:
+        pass
+
+    def _walk_shard(top: str):
+        # Explicit-stack walk that lists each directory fully before
+        # descending, so marker flags are known at the recursion boundary
+        # and pruned subtrees (_active mirrors, migoto internals) are
+        # never entered instead of being filtered out afterwards.
+        local_meta: dict = {top: [False, False]}
+        local_dirs: List[str] = []
+        stack = [top]
+        while stack:
+            cur = stack.pop()
+            try:
+                it = os.scandir(cur)
+            except OSError:
+                continue
+            meta = local_meta[cur]
+            subdirs: List[tuple[str, str]] = []
+            try:
+                for entry in it:
+                    try:
+                        if entry.is_symlink():
+                            continue
+                        name = entry.name.lower()
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append((name, entry.path))
+                            if name in ("texture", "buffer"):
+                                meta[0] = True
+                        elif entry.is_file(follow_symlinks=False):
+                            if name == "d3dx.ini":
+                                meta[0] = True
+                            elif name.endswith((".dds", ".buf")):
+                                meta[1] = True
+                    except OSError:
+                        continue
+            finally:
+                it.close()
+            has_migoto_marker_here = meta[0] or meta[1]
+            for name, path in subdirs:
+                if name in _PRUNE_DIR_NAMES or name.startswith(_SCRATCH_DIR_PREFIXES):
+                    continue
+                # Inside a migoto mod, internals like Texture/ and
+                # shaders/ can hold thousands of files that never
+                # produce a listing; skip the whole subtree.
+                if has_migoto_marker_here and name in NOT_A_MOD_FOLDER_NAMES:
+                    continue
+                local_meta[path] = [False, False]
+                local_dirs.append(path)
+                stack.append(path)
+        return local_dirs, local_meta
+
+    if len(shards) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(shards))) as pool:
+            results = list(pool.map(_walk_shard, shards))
+    else:
+        results = [_walk_shard(top) for top in shards]
+
+    for local_dirs, local_meta in results:
+        seen_dirs.extend(local_dirs)
+        for path, meta in local_meta.items():
+            cur = dir_meta.get(path)
+            if cur is None:
+                dir_meta[path] = meta
+            else:
+                cur[0] = cur[0] or meta[0]
+                cur[1] = cur[1] or meta[1]
+
+    # Bubble the dds/buf flag up so it means "anywhere inside", deepest first
+    for path in sorted(dir_meta, key=lambda p: p.count(os.sep), reverse=True):
+        if dir_meta[path][1]:
+            parent_meta = dir_meta.get(os.path.dirname(path))
+            if parent_meta is not None:
+                parent_meta[1] = True
+
+    migoto_dirs = {p for p, meta in dir_meta.items() if meta[0] or meta[1]}
+
+    # Every seen path shares the root prefix, so the relative posix path
+    # is one slice + one replace on the scandir-provided string instead
+    # of a relative_to()/as_posix() pathlib round trip per candidate.
+    prefix_len = len(root_str) + len(os.sep)
+
+    candidates: List[tuple[str, str]] = []
+
+    for path in seen_dirs:
+        rel_posix = path[prefix_len:].replace(os.sep, "/")
+        depth = rel_posix.count("/") + 1
+
+        # Top-level folders (mods/misc, mods/skins, ...) are containers
+        if depth == 1:
+            continue
+
+        if _is_subfolder_that_should_not_be_listed(
+            path, os.path.basename(path), depth, migoto_dirs
+        ):
+            continue
+
+        if not _folder_has_any_file(path):
+            continue
+
+        candidates.append((path, rel_posix))
+
+    # Sort on precomputed key tuples: lowering per comparison would
+    # re-materialize the same strings O(N log N) times.
+    keyed = sorted(
+        ((rel.count("/"), path.lower()), path, rel) for path, rel in set(candidates)
+    )
+    candidate_set = {path for _, path, _ in keyed}
+
+    # One pass over every candidate's ancestry replaces the O(N²)
+    # "is d a parent of any other candidate" scan below.
+    parent_of_candidate: set = set()
+    for c in candidate_set:
+        anc = os.path.dirname(c)
+        while len(anc) > len(root_str):
+            if anc in candidate_set:
+                parent_of_candidate.add(anc)
+            anc = os.path.dirname(anc)
+
+    final: List[tuple[str, str]] = []
+
+    for _, path, rel in keyed:
+        # If a child dir is also a candidate, this might just be a
+        # container for multiple mods
+        has_child_candidate = path in parent_of_candidate
+
+        looks_like_mod = (
+            _looks_like_migoto_mod_folder(path)
+            or _looks_like_asset_mod_folder(path)
+            or _looks_like_config_mod_folder(path)
+        )
+
+        if looks_like_mod:
+            final.append((path, rel))
+            continue
+
+        # If it doesn't look like a mod folder, keep only if leaf
+        if not has_child_candidate:
+            final.append((path, rel))
+
+    return final
+
+
+# The GUI rescans after every toggle; most of those rescans see an
+# unchanged tree. Key the last result on a cheap fingerprint (root mtime
+# plus one scandir level of top-level names/mtimes) so the unchanged
+# case costs one directory read. Deep edits that don't touch top-level
+# mtimes are covered by invalidate_scan_cache() from the GUI's own
+# mutation paths (import, install, delete).
+_SCAN_CACHE: dict = {}  # str(mods_root) -> (fingerprint, List[ModInfo])
+
+
+def _scan_fingerprint(mods_root: Path):
+    try:
+        parts = [mods_root.stat().st_mtime_ns]
+        with os.scandir(mods_root) as it:
+            for entry in it:
+                try:
+                    parts.append((entry.name, entry.stat(follow_symlinks=False).st_mtime_ns))
+                except OSError:
+                    continue
+    except OSError:
+        return None
+    parts[1:] = sorted(parts[1:])
+    return tuple(parts)
+
+
+def invalidate_scan_cache() -> None:
+    """Drop cached scan results; call after mutating the mods tree."""
+    _SCAN_CACHE.clear()
+
+
+def _fill_manifest_meta(mods_root: Path, mods: List[ModInfo]) -> None:
+    """
+    Fill version/author/description from each mod's manifest.json.
+
+    Reads are I/O-bound and independent, so they fan out on a thread
+    pool; each goes through the mtime-keyed read_manifest cache, so a
+    warm rescan costs one stat per manifest instead of a read+parse.
+    """
+    def _read_meta(m: ModInfo) -> None:
+        try:
+            data = read_manifest(mods_root / m.rel_path / "manifest.json")
+        except OSError:
+            return  # no manifest — perfectly normal
+        except Exception:
+            m.warnings.append("manifest.json is invalid")
+            return
+        if isinstance(data, dict):
+            m.version = str(data.get("version") or "")
+            m.author = str(data.get("author") or "")
+            m.description = str(data.get("description") or "")
+
+    if len(mods) > 1:
+        with ThreadPoolExecutor(max_workers=min(16, len(mods))) as pool:
+            list(pool.map(_read_meta, mods))
+    else:
+        for m in mods:
+            _read_meta(m)
+
+
+def scan_mods(mods_root: Path) -> List[ModInfo]:
+    mods_root = Path(mods_root).resolve()
+    key = str(mods_root)
+    fingerprint = _scan_fingerprint(mods_root)
+    if fingerprint is not None:
+        hit = _SCAN_CACHE.get(key)
+        if hit is not None and hit[0] == fingerprint:
+            return hit[1]
+
+    _classify.cache_clear()  # folders may have changed since the last scan
+    mods: List[ModInfo] = []
+
+    for folder, rel_norm in _iter_real_mod_folders(mods_root):
+        errors: List[str] = []
+        warnings: List[str] = []
+
+        if _looks_like_migoto_mod_folder(folder):
+            mod_type = "migoto"
+        elif _looks_like_asset_mod_folder(folder):
+            mod_type = "asset"
+        elif _looks_like_config_mod_folder(folder):
+            mod_type = "config"
+        else:
+            mod_type = "folder"
+
+        name = rel_norm.rsplit("/", 1)[-1]
+        mods.append(
+            ModInfo(
+                name=name,
+                rel_path=rel_norm,
+                mod_type=mod_type,
+                errors=errors,
+                warnings=warnings,
+                name_lc=name.lower(),
+                rel_lc=rel_norm.lower(),
+            )
+        )
+
+    _fill_manifest_meta(mods_root, mods)
+    for m in mods:
+        m.search_key = f"{m.name}\n{m.rel_path}\n{m.author}".casefold()
+        parts = [
+            f"Type: {m.mod_type}",
+            f"Version: {m.version}",
+            f"Author: {m.author}",
+            "",
+            m.description or "",
+        ]
+        if m.errors:
+            parts += ["", "Errors:", *(f"- {e}" for e in m.errors)]
+        if m.warnings:
+            parts += ["", "Warnings:", *(f"- {w}" for w in m.warnings)]
+        m.details_text = "\n".join(parts)
+        tips = [m.rel_path]
+        if m.errors:
+            tips.append("Errors:\n- " + "\n- ".join(m.errors))
+        if m.warnings:
+            tips.append("Warnings:\n- " + "\n- ".join(m.warnings))
+        m.tooltip_text = "\n\n".join(tips)
+
+    order = {"migoto": 0, "asset": 1, "config": 2, "folder": 3}
+    mods.sort(key=lambda m: (order.get(m.mod_type, 99), m.name_lc, m.rel_lc))
+    if fingerprint is not None:
+        _SCAN_CACHE[key] = (fingerprint, mods)
+    return mods
@@ -1,791 +1,1484 @@
-from __future__ import annotations
-
-import json
-import os
-import shutil
-import subprocess
-import ctypes
-import tempfile
-from pathlib import Path
-from typing import List, Optional, Tuple
-
-from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer, QUrl
-from PySide6.QtGui import QDesktopServices
-from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QListView, QLabel, QPushButton, QTextEdit, QLineEdit, QSplitter,
-    QMessageBox, QFileDialog, QAbstractItemView, QStyleOptionViewItem, QStyle,
-    QComboBox
-)
-
-from launcher.core.config import AppConfig
-from launcher.core.mods import ModInfo, scan_mods
-from launcher.core.active_pack import build_active
-from launcher.core.deploy import (
-    deploy_endfield_modsafe,
-    restore_endfield_modsafe,
-    detect_enabled_path_conflicts,
-    detect_enabled_asset_conflicts,
-    deploy_assets_no_manifest,
-    restore_assets_no_manifest,
-    deploy_3dmigoto_folder_mods,
-    get_modsafe_paths,
-)
-
-# =========================================================
-# WinError 740 safe launcher (supports args)
-# =========================================================
-
-def launch_exe_windows(exe_path: Path, args: Optional[List[str]] = None) -> None:
-    exe_path = Path(exe_path)
-    cwd = str(exe_path.parent)
-    params = " ".join(args or [])
-
-    rc = ctypes.windll.shell32.ShellExecuteW(None, "open", str(exe_path), params, cwd, 1)
-    if rc <= 32:
-        rc = ctypes.windll.shell32.ShellExecuteW(None, "runas", str(exe_path), params, cwd, 1)
-        if rc <= 32:
-            raise RuntimeError(f"ShellExecute failed (code {rc}).")
-
-
-# =========================================================
-# JSON helpers
-# =========================================================
-
-def json_load(path: Path) -> dict:
-    text = path.read_text(encoding="utf-8-sig").strip()
-    if not text:
-        raise ValueError(f"Empty JSON file: {path}")
-    return json.loads(text)
-
-
-def safe_rmtree(path: Path) -> None:
-    if path.exists():
-        shutil.rmtree(path, ignore_errors=True)
-
-
-# =========================================================
-# Renderer choice persistence (SELF-CONTAINED)
-# =========================================================
-
-RENDERER_FILE = "renderer.json"
-
-def load_renderer_choice(project_root: Path) -> str:
-    p = project_root / RENDERER_FILE
-    if not p.exists():
-        return "auto"
-    try:
-        d = json.loads(p.read_text(encoding="utf-8"))
-        v = str(d.get("renderer", "auto")).lower()
-        return v if v in ("auto", "dx11", "dx12") else "auto"
-    except Exception:
-        return "auto"
-
-def save_renderer_choice(project_root: Path, value: str) -> None:
-    p = project_root / RENDERER_FILE
-    p.write_text(json.dumps({"renderer": value}, indent=2), encoding="utf-8")
-
-
-def build_renderer_args(choice: str) -> List[str]:
-    choice = (choice or "auto").lower()
-    if choice == "dx11":
-        return ["-force-d3d11", "-force-feature-level-11-0"]
-    if choice == "dx12":
-        return ["-force-d3d12"]
-    return []
-
-
-# =========================================================
-# ZIP Import helpers (GameBanana-style)
-# =========================================================
-
-_ALLOWED_ASSET_ROOTS = ("Endfield_Data", "resources", "game_files", "translations", "plugins")
-
-def _dir_has_migoto_markers(p: Path) -> bool:
-    if (p / "Texture").exists() or (p / "Buffer").exists() or (p / "d3dx.ini").exists():
-        return True
-    for f in p.rglob("*"):
-        if f.is_file():
-            n = f.name.lower()
-            if n.endswith(".dds") or n.endswith(".buf"):
-                return True
-    return False
-
-def _dir_has_asset_roots(p: Path) -> bool:
-    for root in _ALLOWED_ASSET_ROOTS:
-        if (p / root).exists():
-            return True
-    return False
-
-def _unwrap_single_folder(root: Path) -> Path:
-    """If zip extracted into a single top-level folder, descend into it (handles nested packaging)."""
-    cur = root
-    for _ in range(6):
-        entries = [x for x in cur.iterdir() if x.name not in ("__MACOSX",) and not x.name.startswith(".")]
-        dirs = [x for x in entries if x.is_dir()]
-        files = [x for x in entries if x.is_file()]
-        if len(dirs) == 1 and len(files) == 0:
-            cur = dirs[0]
-            continue
-        break
-    return cur
-
-def _pick_best_mod_folder(extracted_root: Path) -> Tuple[Path, str]:
-    """
-    Chooses the folder we should copy into mods/misc/<name>.
-    1) Prefer 3DMigoto markers (Texture/Buffer/d3dx.ini/.dds/.buf)
-    2) Else prefer asset roots (Endfield_Data/, resources/, ...)
-    3) Else fall back to unwrapped root
-    """
-    base = _unwrap_single_folder(extracted_root)
-
-    if _dir_has_migoto_markers(base) or _dir_has_asset_roots(base):
-        return base, base.name
-
-    candidates: List[Path] = []
-    for d in base.rglob("*"):
-        if d.is_dir() and (_dir_has_migoto_markers(d) or _dir_has_asset_roots(d)):
-            candidates.append(d)
-
-    if candidates:
-        candidates.sort(key=lambda p: (0 if _dir_has_migoto_markers(p) else 1, len(p.parts)))
-        chosen = candidates[0]
-        return chosen, chosen.name
-
-    return base, base.name
-
-def _unique_dest(parent: Path, name: str) -> Path:
-    """Avoid overwrite by suffixing _1, _2..."""
-    safe = "".join(c for c in name if c not in r'<>:"/\|?*').strip() or "ImportedMod"
-    dest = parent / safe
-    if not dest.exists():
-        return dest
-    for i in range(1, 1000):
-        cand = parent / f"{safe}_{i}"
-        if not cand.exists():
-            return cand
-    return parent / f"{safe}_{os.getpid()}"
-
-
-# =========================================================
-# Qt model/view
-# =========================================================
-
-class ModsModel(QAbstractListModel):
-    def __init__(self, mods: List[ModInfo], cfg: AppConfig, on_toggle_cb, is_loading_fn, status_fn):
-        super().__init__()
-        self.mods = mods
-        self.cfg = cfg
-        self.filter = ""
-        self.on_toggle_cb = on_toggle_cb
-        self.is_loading_fn = is_loading_fn
-        self.status_fn = status_fn
-        self._user_toggle_gate = False
-
-    def rowCount(self, parent=QModelIndex()) -> int:
-        return len(self.visible())
-
-    def visible(self) -> List[ModInfo]:
-        if not self.filter:
-            return self.mods
-        f = self.filter.lower()
-        return [m for m in self.mods if f in m.rel_path.lower() or f in m.name.lower()]
-
-    def data(self, index: QModelIndex, role: int):
-        m = self.visible()[index.row()]
-
-        if role == Qt.DisplayRole:
-            tag = f"[{m.mod_type.upper()}]"
-            status = " [ERROR]" if m.errors else (" [WARN]" if m.warnings else "")
-            return f"{m.name} {tag} — {m.rel_path}{status}"
-
-        if role == Qt.CheckStateRole:
-            return Qt.Checked if self.cfg.is_enabled(m.rel_path) else Qt.Unchecked
-
-        if role == Qt.ToolTipRole:
-            tips = [m.rel_path]
-            if m.errors:
-                tips.append("Errors:\n- " + "\n- ".join(m.errors))
-            if m.warnings:
-                tips.append("Warnings:\n- " + "\n- ".join(m.warnings))
-            return "\n\n".join(tips)
-
-        return None
-
-    def flags(self, index: QModelIndex):
-        m = self.visible()[index.row()]
-        base = Qt.ItemIsSelectable | Qt.ItemIsEnabled
-        if m.errors:
-            return base
-        return base | Qt.ItemIsUserCheckable
-
-    def setData(self, index: QModelIndex, value, role: int) -> bool:
-        if role != Qt.CheckStateRole:
-            return False
-        if self.is_loading_fn():
-            return False
-        if not self._user_toggle_gate:
-            return False
-
-        m = self.visible()[index.row()]
-        if m.errors and value == Qt.Checked:
-            self.status_fn("Mod has errors — cannot enable")
-            return False
-
-        enabled = (value == Qt.Checked)
-        self.cfg.set_enabled(m.rel_path, enabled)
-        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
-
-        self.status_fn(f"{'Enabled' if enabled else 'Disabled'}: {m.rel_path}")
-        self.on_toggle_cb()
-        return True
-
-
-class ModListView(QListView):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
-
-    def mousePressEvent(self, event):
-        idx = self.indexAt(event.pos())
-        if idx.isValid():
-            opt = QStyleOptionViewItem()
-            self.itemDelegate().initStyleOption(opt, idx)
-            opt.rect = self.visualRect(idx)
-
-            style = self.style()
-            check_rect = style.subElementRect(QStyle.SE_ItemViewItemCheckIndicator, opt, self)
-
-            if check_rect.contains(event.pos()):
-                model = self.model()
-                current = model.data(idx, Qt.CheckStateRole)
-                new_state = Qt.Unchecked if current == Qt.Checked else Qt.Checked
-
-                model._user_toggle_gate = True
-                try:
-                    model.setData(idx, new_state, Qt.CheckStateRole)
-                finally:
-                    model._user_toggle_gate = False
-                return
-
-        super().mousePressEvent(event)
-
-
-# =========================================================
-# Main window
-# =========================================================
-
-class MainWindow(QMainWindow):
-    FOLDER_NAME = "EndfieldModSafe"
-
-    def __init__(self, project_root: Path):
-        super().__init__()
-        self.project_root = project_root
-        self.mods_root = project_root / "mods"
-
-        self.cfg = AppConfig.load(project_root)
-        self.mods: List[ModInfo] = []
-
-        self.renderer_choice = load_renderer_choice(self.project_root)
-
-        self._loading_ui = False
-        self.statusBar().showMessage("Ready")
-
-        self._build_timer = QTimer()
-        self._build_timer.setSingleShot(True)
-        self._build_timer.timeout.connect(self._do_build_active)
-
-        self.model = ModsModel(
-            [],
-            self.cfg,
-            on_toggle_cb=self.queue_build_active,
-            is_loading_fn=lambda: self._loading_ui,
-            status_fn=self.set_status
-        )
-
-        self.setWindowTitle("Endfield Mod Loader (Safe + Asset Replacement)")
-        self.resize(1180, 720)
-
-        root = QWidget()
-        self.setCentralWidget(root)
-        outer = QVBoxLayout(root)
-
-        # ---------------- Top Bar ----------------
-        top = QHBoxLayout()
-
-        top.addWidget(QLabel("Actions"))
-
-        self.actions = QComboBox()
-        self.actions.addItems([
-            "Install Mod Folder",
-            "Build Active Pack",
-            "Restore (Safe + Assets)",
-            "Open Safe Deployed Folder",
-        ])
-        self.actions.setToolTip("Pick an action, then click Run")
-        top.addWidget(self.actions)
-
-        self.btn_run_action = QPushButton("← Run")
-        self.btn_run_action.setToolTip("Runs the selected action from the dropdown")
-        self.btn_run_action.clicked.connect(self.run_selected_action)
-        top.addWidget(self.btn_run_action)
-
-        self.btn_import_zip = QPushButton("Import Mod ZIP")
-        self.btn_import_zip.clicked.connect(self.import_mod_zip)
-        top.addWidget(self.btn_import_zip)
-
-        self.btn_open_folder = QPushButton("Open Mod Folder")
-        self.btn_open_folder.clicked.connect(self.open_selected_mod_folder)
-        top.addWidget(self.btn_open_folder)
-
-        top.addStretch(1)
-
-        self.search = QLineEdit()
-        self.search.setPlaceholderText("Search mods...")
-        self.search.textChanged.connect(self.on_search)
-        top.addWidget(self.search)
-
-        self.btn_refresh = QPushButton("Refresh")
-        self.btn_refresh.clicked.connect(self.refresh)
-        top.addWidget(self.btn_refresh)
-
-        self.renderer_combo = QComboBox()
-        self.renderer_combo.addItems(["Renderer: Auto", "Renderer: Force DX11", "Renderer: Force DX12"])
-        self.renderer_combo.setCurrentIndex(1 if self.renderer_choice == "dx11" else 2 if self.renderer_choice == "dx12" else 0)
-        self.renderer_combo.currentIndexChanged.connect(self.on_renderer_changed)
-        top.addWidget(self.renderer_combo)
-
-        self.btn_deploy = QPushButton("Deploy Mods")
-        self.btn_deploy.clicked.connect(self.deploy_all)
-        top.addWidget(self.btn_deploy)
-
-        self.btn_set_game = QPushButton("Set Game EXE")
-        self.btn_set_game.clicked.connect(self.pick_game_exe)
-        top.addWidget(self.btn_set_game)
-
-        self.btn_launch = QPushButton("Launch Game")
-        self.btn_launch.clicked.connect(self.launch_game)
-        top.addWidget(self.btn_launch)
-
-        outer.addLayout(top)
-
-        # ---------------- Main Split ----------------
-        splitter = QSplitter(Qt.Horizontal)
-        outer.addWidget(splitter, 1)
-
-        self.list_view = ModListView()
-        self.list_view.setModel(self.model)
-        self.list_view.clicked.connect(self.on_select)
-        splitter.addWidget(self.list_view)
-
-        right = QWidget()
-        r = QVBoxLayout(right)
-
-        self.details_title = QLabel("Select a mod")
-        self.details_title.setStyleSheet("font-size:16px; font-weight:600;")
-        self.details = QTextEdit()
-        self.details.setReadOnly(True)
-        self.details.setFixedHeight(260)
-
-        self.active_title = QLabel("Enabled mods")
-        self.active_box = QTextEdit()
-        self.active_box.setReadOnly(True)
-        self.active_box.setFixedHeight(150)
-
-        self.game_title = QLabel("Game EXE")
-        self.game_box = QLineEdit()
-        self.game_box.setReadOnly(True)
-
-        self.log_title = QLabel("Log")
-        self.log = QTextEdit()
-        self.log.setReadOnly(True)
-
-        r.addWidget(self.details_title)
-        r.addWidget(self.details)
-        r.addWidget(self.active_title)
-        r.addWidget(self.active_box)
-        r.addWidget(self.game_title)
-        r.addWidget(self.game_box)
-        r.addWidget(self.log_title)
-        r.addWidget(self.log, 1)
-
-        splitter.addWidget(right)
-        splitter.setSizes([520, 660])
-
-        self.refresh()
-
-    # =========================================================
-    # Actions dropdown runner
-    # =========================================================
-    def run_selected_action(self):
-        action = (self.actions.currentText() or "").strip()
-
-        if action == "Install Mod Folder":
-            self.install_mod_folder()
-            return
-        if action == "Build Active Pack":
-            self.queue_build_active()
-            return
-        if action == "Restore (Safe + Assets)":
-            self.restore_all()
-            return
-        if action == "Open Safe Deployed Folder":
-            self.open_deployed_folder()
-            return
-
-        QMessageBox.information(self, "Unknown action", f"Unhandled action:\n{action}")
-
-    # =========================================================
-    # Log validation (red/green)
-    # =========================================================
-    def log_ok(self, msg: str) -> None:
-        self._log_color(msg, color="#22c55e")
-
-    def log_bad(self, msg: str) -> None:
-        self._log_color(msg, color="#ef4444")
-
-    def log_warn(self, msg: str) -> None:
-        self._log_color(msg, color="#f59e0b")
-
-    def log_info(self, msg: str) -> None:
-        self._log_color(msg, color="#e5e7eb")
-
-    def _log_color(self, msg: str, color: str) -> None:
-        safe = (msg or "").replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        self.log.append(f'<span style="color:{color};">{safe}</span>')
-
-    def on_renderer_changed(self, idx: int):
-        if idx == 1:
-            self.renderer_choice = "dx11"
-        elif idx == 2:
-            self.renderer_choice = "dx12"
-        else:
-            self.renderer_choice = "auto"
-        save_renderer_choice(self.project_root, self.renderer_choice)
-        self.set_status(f"Renderer set: {self.renderer_choice}")
-
-    def _game_root(self) -> Optional[Path]:
-        if not self.cfg.game_exe:
-            return None
-        return Path(self.cfg.game_exe).resolve().parent
-
-    def set_status(self, msg: str):
-        count = len(self.cfg.enabled_mods)
-        final = f"{msg} | Enabled mods: {count}"
-        self.statusBar().showMessage(final)
-        self.log_info(f"[Status] {final}")
-
-    def _enabled_mods_have_errors(self) -> bool:
-        enabled = {x.replace("\\", "/") for x in self.cfg.enabled_mods}
-        by_rel = {m.rel_path.replace("\\", "/"): m for m in self.mods}
-        return any(by_rel.get(rel) and by_rel[rel].errors for rel in enabled)
-
-    def _check_conflicts(self) -> List[str]:
-        conflicts = detect_enabled_path_conflicts(self.mods_root, self.cfg.enabled_mods)
-        if not conflicts:
-            return []
-        lines: List[str] = []
-        for c in conflicts[:50]:
-            lines.append(f"{c.get('path','')}  <=  {', '.join(c.get('mods', []))}")
-        self.set_status(f"Conflicts: {len(conflicts)} (Deploy blocked)")
-        return lines
-
-    def _check_asset_conflicts(self) -> List[str]:
-        conflicts = detect_enabled_asset_conflicts(self.mods_root, self.cfg.enabled_mods)
-        if not conflicts:
-            return []
-        lines: List[str] = []
-        for c in conflicts[:50]:
-            lines.append(f"{c.get('path','')}  <=  {', '.join(c.get('mods', []))}")
-        self.set_status(f"Asset Conflicts: {len(conflicts)} (Deploy blocked)")
-        return lines
-
-    def on_search(self, text: str):
-        self.model.filter = text.strip()
-        self.model.layoutChanged.emit()
-
-    def refresh(self):
-        self._loading_ui = True
-        self.list_view.blockSignals(True)
-
-        self.mods = scan_mods(self.mods_root)
-        self.model.beginResetModel()
-        self.model.mods = self.mods
-        self.model.endResetModel()
-
-        self.list_view.blockSignals(False)
-        self._loading_ui = False
-
-        self.update_enabled_box()
-        self.game_box.setText(self.cfg.game_exe or "")
-        self.set_status(f"Scan: Found {len(self.mods)} mods")
-
-    def update_enabled_box(self):
-        enabled = sorted(self.cfg.enabled_mods)
-        self.active_box.setText("\n".join(enabled) if enabled else "(none)")
-
-    def on_select(self, index: QModelIndex):
-        m = self.model.visible()[index.row()]
-        self.details_title.setText(f"{m.name} — {m.rel_path}")
-
-        lines = [
-            f"Type: {m.mod_type}",
-            f"Version: {m.version}",
-            f"Author: {m.author}",
-            "",
-            m.description or ""
-        ]
-        if m.errors:
-            lines += ["", "Errors:"] + [f"- {e}" for e in m.errors]
-        if m.warnings:
-            lines += ["", "Warnings:"] + [f"- {w}" for w in m.warnings]
-        self.details.setText("\n".join([l for l in lines if l is not None]))
-
-        self.set_status("Mod has errors — cannot enable" if m.errors else f"Selected: {m.rel_path}")
-
-    def queue_build_active(self):
-        self.update_enabled_box()
-        self._build_timer.start(300)
-        self.set_status("Build: queued...")
-
-    def _do_build_active(self):
-        active = build_active(self.mods_root, self.cfg.enabled_mods)
-        self.set_status("Build: OK")
-        self.log_info(f"[Build] Active pack built at: {active}")
-
-    # =========================================================
-    # Import Mod ZIP (GameBanana)
-    # =========================================================
-    def import_mod_zip(self):
-        zip_path, _ = QFileDialog.getOpenFileName(
-            self,
-            "Select Mod ZIP",
-            filter="ZIP/Archive Files (*.zip *.tar *.gz *.tgz);;All Files (*.*)"
-        )
-        if not zip_path:
-            return
-
-        zip_file = Path(zip_path)
-        if not zip_file.exists():
-            QMessageBox.warning(self, "Missing file", f"File not found:\n{zip_file}")
-            return
-
-        dest_parent = self.mods_root / "misc"
-        dest_parent.mkdir(parents=True, exist_ok=True)
-
-        try:
-            with tempfile.TemporaryDirectory(prefix="endfield_mod_import_") as td:
-                extract_root = Path(td)
-                shutil.unpack_archive(str(zip_file), str(extract_root))
-
-                chosen_dir, suggested_name = _pick_best_mod_folder(extract_root)
-
-                generic = {"files", "file", "mod", "mods", "data", "release", "download"}
-                name = suggested_name if suggested_name.lower() not in generic else zip_file.stem
-
-                dest = _unique_dest(dest_parent, name)
-                shutil.copytree(chosen_dir, dest, dirs_exist_ok=True)
-
-                looks_migoto = _dir_has_migoto_markers(dest)
-                looks_asset = _dir_has_asset_roots(dest)
-                kind = "3DMigoto (Texture/Buffer)" if looks_migoto else ("Asset (Endfield_Data/...)" if looks_asset else "Folder")
-                self.log_ok(f"[Import] Imported ZIP -> {dest} ({kind})")
-
-            self.set_status(f"Imported: {zip_file.name}")
-            self.refresh()
-
-        except shutil.ReadError:
-            QMessageBox.critical(
-                self,
-                "Import failed",
-                "Could not unpack this archive.\n\n"
-                "Only .zip/.tar/.gz supported by Python's unpacker.\n"
-                "If it's a .rar or .7z, extract it manually first, then use 'Install Mod Folder'."
-            )
-        except Exception as e:
-            QMessageBox.critical(self, "Import failed", str(e))
-
-    # =========================================================
-    # Deploy / Restore / Open
-    # =========================================================
-    def deploy_all(self):
-        if not self.cfg.game_exe:
-            QMessageBox.warning(self, "No game exe", "Click 'Set Game EXE' first.")
-            return
-
-        conflicts = self._check_conflicts()
-        if conflicts:
-            QMessageBox.warning(self, "Conflicts detected", "Fix these first:\n\n- " + "\n- ".join(conflicts))
-            return
-
-        asset_conflicts = self._check_asset_conflicts()
-        if asset_conflicts:
-            QMessageBox.warning(self, "Asset Conflicts detected", "Fix these first:\n\n- " + "\n- ".join(asset_conflicts))
-            return
-
-        if self._enabled_mods_have_errors():
-            QMessageBox.warning(self, "Blocked", "One or more enabled mods has errors. Fix that first.")
-            return
-
-        if not self._game_root():
-            QMessageBox.warning(self, "No game root", "Bad EXE path.")
-            return
-
-        try:
-            self.set_status("Deploy: running...")
-            self._do_build_active()
-
-            result = deploy_endfield_modsafe(
-                project_root=self.project_root,
-                mods_root=self.mods_root,
-                enabled_mods=self.cfg.enabled_mods,
-                game_exe=self.cfg.game_exe,
-                folder_name=self.FOLDER_NAME,
-            )
-            self.log_info(f"[SafeDeploy] {getattr(result, 'dest_active', '')}")
-
-            migoto_files = deploy_3dmigoto_folder_mods(
-                mods_root=self.mods_root,
-                enabled_mods=list(self.cfg.enabled_mods),
-                game_exe=self.cfg.game_exe,
-                log_fn=self.log_info,
-            )
-
-            asset_files = deploy_assets_no_manifest(
-                project_root=self.project_root,
-                mods_root=self.mods_root,
-                enabled_mods=list(self.cfg.enabled_mods),
-                game_exe=self.cfg.game_exe,
-                log_fn=self.log_info,
-            )
-
-            safe_count = int(getattr(result, "file_count", 0) or 0)
-            if safe_count > 0:
-                self.log_ok(f"[SafeDeploy] OK — {safe_count} file(s) active-mounted")
-            else:
-                self.log_warn("[SafeDeploy] Built active pack, but 0 files copied")
-
-            if migoto_files > 0:
-                self.log_ok(f"[3DMigoto] OK — {migoto_files} file(s) copied into game/Mods/")
-            else:
-                self.log_bad("[3DMigoto] NOT DEPLOYED — no Texture/Buffer/.dds/.buf/d3dx.ini detected in enabled mod(s)")
-
-            if asset_files > 0:
-                self.log_ok(f"[Assets] OK — {asset_files} file(s) replaced in game folder")
-            else:
-                self.log_warn("[Assets] No asset files deployed (must be under Endfield_Data/resources/game_files/etc).")
-
-            self.set_status(f"Deploy: OK (migoto: {migoto_files}, assets: {asset_files})")
-
-        except PermissionError as e:
-            QMessageBox.critical(self, "Deploy failed", f"Permission denied.\n\n{e}")
-        except Exception as e:
-            QMessageBox.critical(self, "Deploy failed", str(e))
-
-    def restore_all(self):
-        if not self.cfg.game_exe:
-            QMessageBox.warning(self, "No game exe", "Click 'Set Game EXE' first.")
-            return
-        try:
-            restore_endfield_modsafe(self.cfg.game_exe, folder_name=self.FOLDER_NAME)
-            self.log_ok("[SafeDeploy] Restored mounted active folder")
-
-            restored = restore_assets_no_manifest(
-                project_root=self.project_root,
-                game_exe=self.cfg.game_exe,
-                log_fn=self.log_info,
-                clear_receipt=True,
-            )
-            self.log_ok(f"[Assets] Restored/removed: {restored}" if restored > 0 else "[Assets] Nothing restored/removed (receipt empty)")
-
-            self.set_status("Restore: OK")
-        except Exception as e:
-            QMessageBox.critical(self, "Restore failed", str(e))
-
-    def open_deployed_folder(self):
-        if not self.cfg.game_exe:
-            QMessageBox.warning(self, "No game exe", "Click 'Set Game EXE' first.")
-            return
-        backend, safe_root, dest_active = get_modsafe_paths(self.cfg.game_exe, self.FOLDER_NAME)
-        if not dest_active.exists():
-            QMessageBox.information(self, "Not deployed yet", f"Deployed folder not found:\n{dest_active}\n\nClick Deploy first.")
-            return
-        QDesktopServices.openUrl(QUrl.fromLocalFile(str(dest_active)))
-        self.set_status(f"Opened deployed folder ({backend})")
-
-    def open_selected_mod_folder(self):
-        idx = self.list_view.currentIndex()
-        if not idx.isValid():
-            QMessageBox.information(self, "No selection", "Select a mod first.")
-            return
-        m = self.model.visible()[idx.row()]
-        folder = (self.mods_root / m.rel_path).resolve()
-        if not folder.exists():
-            QMessageBox.warning(self, "Missing folder", f"Folder not found:\n{folder}")
-            return
-        QDesktopServices.openUrl(QUrl.fromLocalFile(str(folder)))
-        self.set_status(f"Opened: {m.rel_path}")
-
-    # =========================================================
-    # Install folder / Game EXE / Launch
-    # =========================================================
-    def install_mod_folder(self):
-        src = QFileDialog.getExistingDirectory(self, "Select Mod Folder to Install")
-        if not src:
-            return
-
-        src_path = Path(src)
-        dest_parent = (self.mods_root / "misc")
-        dest_parent.mkdir(parents=True, exist_ok=True)
-
-        dest = dest_parent / src_path.name
-        if dest.exists():
-            res = QMessageBox.question(self, "Overwrite?", f"{dest} already exists.\nOverwrite it?")
-            if res != QMessageBox.Yes:
-                return
-            shutil.rmtree(dest)
-
-        shutil.copytree(src_path, dest)
-        self.set_status(f"Installed: {src_path.name}")
-        self.refresh()
-
-    def pick_game_exe(self):
-        exe, _ = QFileDialog.getOpenFileName(self, "Select Game EXE", filter="EXE Files (*.exe)")
-        if not exe:
-            return
-        self.cfg.set_game_exe(exe)
-        self.game_box.setText(exe)
-        self.set_status("Game EXE set")
-
-    def launch_game(self):
-        exe = self.cfg.game_exe
-        if not exe:
-            QMessageBox.warning(self, "No game exe", "Click 'Set Game EXE' first.")
-            return
-
-        exe_path = Path(exe)
-        if not exe_path.exists():
-            QMessageBox.warning(self, "Missing exe", f"EXE not found:\n{exe}")
-            return
-
-        self.deploy_all()
-
-        args = build_renderer_args(self.renderer_choice)
-        self.log_info(f"[Launch] Renderer args: {' '.join(args)}" if args else "[Launch] Renderer args: (none)")
-
-        try:
-            if os.name == "nt":
-                launch_exe_windows(exe_path, args=args)
-            else:
-                subprocess.Popen([str(exe_path), *args], cwd=str(exe_path.parent))
-            self.set_status("Launch: OK")
-        except Exception as e:
-            QMessageBox.critical(self, "Launch failed", str(e))
-
-
-def run():
-    app = QApplication([])
-    project_root = Path(__file__).resolve().parents[1]
-    win = MainWindow(project_root)
-    win.show()
-    app.exec()
+from __future__ import annotations
+
+import array
+import difflib
+from bisect import bisect_right
+import os
+import re
+import shutil
+import subprocess
+import sys
+import ctypes
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from PySide6.QtCore import (
+    Qt, QAbstractListModel, QModelIndex, QTimer, QUrl,
+    QObject, QRunnable, QThreadPool, Signal, QFileSystemWatcher,
+)
+from PySide6.QtGui import QColor, QDesktopServices, QTextCharFormat, QTextCursor
+from PySide6.QtWidgets import (
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+    QListView, QLabel, QPushButton, QPlainTextEdit, QLineEdit, QSplitter,
+    QMessageBox, QFileDialog, QAbstractItemView, QStyleOptionViewItem, QStyle,
+    QComboBox
+)
+
+from launcher.core.config import AppConfig
+from launcher.core.jsonio import dumps_indented, read_json_fast
+from launcher.core.mods import (
+    ModInfo,
+    scan_mods,
+    invalidate_scan_cache,
+    _classify as _classify_mod_dir,
+    _scan_fingerprint,
+)
+from launcher.core.active_pack import build_active
+from launcher.core.deploy import (
+    deploy_endfield_modsafe,
+    restore_endfield_modsafe,
+    detect_enabled_path_conflicts,
+    detect_enabled_asset_conflicts,
+    deploy_assets_no_manifest,
+    restore_assets_no_manifest,
+    deploy_3dmigoto_folder_mods,
+    get_modsafe_paths,
+    ModIndex,
+    _fast_rmtree,
+)
+
+# =========================================================
+# WinError 740 safe launcher (supports args)
+# =========================================================
+
+# Bind and prototype the function pointer once: the windll attribute
+# chain re-resolves per access, and explicit argtypes avoid ctypes'
+# default pointer marshalling guesses. c_ssize_t keeps the <=32 error
+# convention comparable (HINSTANCE would come back as None for 0).
+if sys.platform == "win32":
+    from ctypes import wintypes
+
+    _ShellExecuteW = ctypes.windll.shell32.ShellExecuteW
+    _ShellExecuteW.argtypes = [
+        wintypes.HWND, wintypes.LPCWSTR, wintypes.LPCWSTR,
+        wintypes.LPCWSTR, wintypes.LPCWSTR, ctypes.c_int,
+    ]
+    _ShellExecuteW.restype = ctypes.c_ssize_t
+else:
+    _ShellExecuteW = None
+
+
+def launch_exe_windows(exe_path: Path, args: Optional[List[str]] = None) -> None:
+    exe_path = Path(exe_path)
+    cwd = str(exe_path.parent)
+    params = " ".join(args or [])
+
+    rc = _ShellExecuteW(None, "open", str(exe_path), params, cwd, 1)
+    if rc <= 32:
+        rc = _ShellExecuteW(None, "runas", str(exe_path), params, cwd, 1)
+        if rc <= 32:
+            raise RuntimeError(f"ShellExecute failed (code {rc}).")
+
+
+# =========================================================
+# JSON helpers
+# =========================================================
+
+def json_load(path: Path) -> dict:
+    data = read_json_fast(path)
+    if not data:
+        raise ValueError(f"Empty JSON file: {path}")
+    return data
+
+
+def safe_rmtree(path: Path) -> None:
+    # Platform bulk deleters (rd /s /q, rm -rf) remove a large extracted
+    # pack in one process instead of a Python unlink per file; falls
+    # back to shutil.rmtree where they are unavailable.
+    if path.exists():
+        _fast_rmtree(path, ignore_errors=True)
+
+
+# =========================================================
+# Renderer choice persistence (SELF-CONTAINED)
+# =========================================================
+
+RENDERER_FILE = "renderer.json"
+
+def load_renderer_choice(project_root: Path) -> str:
+    p = project_root / RENDERER_FILE
+    if not p.exists():
+        return "auto"
+    try:
+        d = read_json_fast(p)
+        v = str(d.get("renderer", "auto")).lower()
+        return v if v in ("auto", "dx11", "dx12") else "auto"
+    except Exception:
+        return "auto"
+
+def save_renderer_choice(project_root: Path, value: str) -> None:
+    p = project_root / RENDERER_FILE
+    p.write_bytes(dumps_indented({"renderer": value}))
+
+
+def build_renderer_args(choice: str) -> List[str]:
+    choice = (choice or "auto").lower()
+    if choice == "dx11":
+        return ["-force-d3d11", "-force-feature-level-11-0"]
+    if choice == "dx12":
+        return ["-force-d3d12"]
+    return []
+
+
+# =========================================================
+# ZIP Import helpers (GameBanana-style)
+# =========================================================
+
+# Wrapper folder names that tell us nothing about the mod — fall back to
+# the archive's own name instead.
+GENERIC_WRAPPER_NAMES = frozenset({"files", "file", "mod", "mods", "data", "release", "download"})
+
+
+def _unwrap_single_folder(root: Path) -> Path:
+    """If zip extracted into a single top-level folder, descend into it (handles nested packaging)."""
+    cur = root
+    for _ in range(6):
+        entries = [x for x in cur.iterdir() if x.name not in ("__MACOSX",) and not x.name.startswith(".")]
+        dirs = [x for x in entries if x.is_dir()]
+        files = [x for x in entries if x.is_file()]
+        if len(dirs) == 1 and len(files) == 0:
+            cur = dirs[0]
+            continue
+        break
+    return cur
+
+def _pick_best_mod_folder(extracted_root: Path) -> Tuple[Path, str]:
+    """
+    Chooses the folder we should copy into mods/misc/<name>.
+    1) Prefer 3DMigoto markers (Texture/Buffer/d3dx.ini/.dds/.buf)
+    2) Else prefer asset roots (Endfield_Data/, resources/, ...)
+    3) Else fall back to unwrapped root
+    """
+    base = _unwrap_single_folder(extracted_root)
+
+    # One bottom-up os.walk classifies every directory from its own
+    # dirnames/filenames lists (plus a bubbled-up .dds/.buf flag) —
+    # no per-candidate subtree re-walks.
+    asset_roots = ("endfield_data", "resources", "game_files", "translations", "plugins")
+    dds_under: dict = {}
+    is_migoto: dict = {}
+    is_asset: dict = {}
+    walked: List[str] = []
+
+    for dirpath, dirnames, filenames in os.walk(base, topdown=False, followlinks=False):
+        child_lower = {n.lower() for n in dirnames} | {n.lower() for n in filenames}
+        dds_below = any(n.lower().endswith((".dds", ".buf")) for n in filenames) or any(
+            dds_under.get(os.path.join(dirpath, d), False) for d in dirnames
+        )
+        dds_under[dirpath] = dds_below
+        is_migoto[dirpath] = (
+            "texture" in child_lower
+            or "buffer" in child_lower
+            or "d3dx.ini" in child_lower
+            or dds_below
+        )
+        is_asset[dirpath] = any(r in child_lower for r in asset_roots)
+        walked.append(dirpath)
+
+    base_str = os.fspath(base)
+    if is_migoto.get(base_str) or is_asset.get(base_str):
+        return base, base.name
+
+    candidates = [p for p in walked if p != base_str and (is_migoto[p] or is_asset[p])]
+    if candidates:
+        candidates.sort(key=lambda p: (0 if is_migoto[p] else 1, p.count(os.sep)))
+        chosen = Path(candidates[0])
+        return chosen, chosen.name
+
+    return base, base.name
+
+def _unique_dest(parent: Path, name: str) -> Path:
+    """Avoid overwrite by suffixing _1, _2... (one scandir, no per-probe stat)."""
+    safe = "".join(c for c in name if c not in r'<>:"/\|?*').strip() or "ImportedMod"
+    try:
+        with os.scandir(parent) as it:
+            existing = {e.name for e in it}
+    except OSError:
+        return parent / f"{safe}_{os.getpid()}"
+
+    if safe not in existing:
+        return parent / safe
+
+    pat = re.compile(rf"{re.escape(safe)}_(\d+)$")
+    taken = [int(m.group(1)) for m in map(pat.match, existing) if m]
+    return parent / f"{safe}_{max(taken, default=0) + 1}"
+
+
+# =========================================================
+# Background tasks (QThreadPool)
+# =========================================================
+
+class _TaskSignals(QObject):
+    log = Signal(str)
+    progress = Signal(int, int)
+    done = Signal(object)
+
+
+class _BgTask(QRunnable):
+    """
+    Runs fn(log_fn, progress_fn) on the global thread pool. Log lines and
+    progress ticks are emitted as queued signals, so slots connected from
+    the GUI thread run on the GUI thread; the result (or the raised
+    exception) comes back through `done`.
+    """
+
+    def __init__(self, fn):
+        super().__init__()
+        self.signals = _TaskSignals()
+        self._fn = fn
+
+    def run(self):
+        try:
+            result = self._fn(self.signals.log.emit, self.signals.progress.emit)
+        except Exception as e:
+            self.signals.done.emit(e)
+        else:
+            self.signals.done.emit(result)
+
+
+# =========================================================
+# Qt model/view
+# =========================================================
+
+class ModList:
+    """
+    Structure-of-arrays view over a scan result.
+
+    Qt role queries and filtering touch one field of many rows, so the
+    hot columns (names, rel paths, types, error/warn flags, search keys)
+    live in parallel lists indexed by row instead of per-object
+    attribute lookups on ModInfo instances. visible_idx is the filtered
+    row set as a compact int array; the original ModInfo objects stay
+    reachable for the cold per-row call sites (selection, tooltips).
+    """
+
+    __slots__ = (
+        "infos", "names", "rels", "types", "err_flags", "warn_flags",
+        "displays", "search_keys", "haystack", "offsets", "visible_idx",
+        "filter_memo",
+    )
+
+    def __init__(self, mods: List[ModInfo]):
+        self.infos = mods
+        self.names = [m.name for m in mods]
+        self.rels = [m.rel_path for m in mods]
+        self.types = [m.mod_type for m in mods]
+        self.err_flags = array.array("b", (1 if m.errors else 0 for m in mods))
+        self.warn_flags = array.array("b", (1 if m.warnings else 0 for m in mods))
+        # Row labels rendered up front: DisplayRole is the hottest role
+        # Qt asks for, and a column built once beats a lazily filled
+        # dict that needs invalidation when flags change.
+        self.displays = [
+            f"{m.name} [{m.mod_type.upper()}] — {m.rel_path}"
+            + (" [ERROR]" if m.errors else (" [WARN]" if m.warnings else ""))
+            for m in mods
+        ]
+        self.search_keys = [m.search_key for m in mods]
+        # One joined buffer + row-start offsets: substring filtering is
+        # then a C-level str.find loop over a single string instead of
+        # a Python-level `in` per row. Keys contain no newline the user
+        # can type, so a match never straddles the join separator.
+        self.haystack = "\n".join(self.search_keys)
+        offsets = [0]
+        acc = 0
+        for key in self.search_keys:
+            acc += len(key) + 1
+            offsets.append(acc)
+        self.offsets = offsets
+        self.visible_idx = array.array("i", range(len(mods)))
+        # Query -> visible rows. Typing and then deleting re-runs the
+        # same prefixes; the rows can't change under a fixed ModList, so
+        # repeat queries are a dict hit.
+        self.filter_memo: dict = {}
+
+    def set_filter(self, f_lower: str) -> None:
+        if not f_lower:
+            self.visible_idx = array.array("i", range(len(self.infos)))
+            return
+        memo = self.filter_memo
+        hit = memo.get(f_lower)
+        if hit is not None:
+            self.visible_idx = hit
+            return
+        # A leading ^ anchors the query to the start of the mod name,
+        # which rejects on the first character instead of scanning the
+        # whole haystack. The predicate is hoisted out of the loop so
+        # each row costs one call, not an attribute lookup + call.
+        if f_lower.startswith("^"):
+            needle = f_lower[1:]
+            test = str.startswith
+            self.visible_idx = memo[f_lower] = array.array(
+                "i", (i for i, key in enumerate(self.search_keys) if test(key, needle))
+            )
+            return
+        # Substring mode: scan the joined buffer with str.find and map
+        # each hit offset back to its row, resuming the scan at the next
+        # row start so every row is reported at most once (in order).
+        hay = self.haystack
+        offsets = self.offsets
+        hits = array.array("i")
+        pos = hay.find(f_lower)
+        while pos >= 0:
+            row = bisect_right(offsets, pos) - 1
+            hits.append(row)
+            pos = hay.find(f_lower, offsets[row + 1])
+        if len(memo) >= 64:
+            memo.clear()
+        self.visible_idx = memo[f_lower] = hits
+
+
+class ModsModel(QAbstractListModel):
+    def __init__(self, mods: List[ModInfo], cfg: AppConfig, on_toggle_cb, is_loading_fn, status_fn):
+        super().__init__()
+        self.cfg = cfg
+        self.filter = ""
+        self._filter_cf = ""  # casefolded once per filter change
+        self.on_toggle_cb = on_toggle_cb
+        self.is_loading_fn = is_loading_fn
+        self.status_fn = status_fn
+        self._user_toggle_gate = False
+        # Qt hammers rowCount/data during paints; the SoA keeps the hot
+        # columns (including pre-rendered row labels) and the filtered
+        # index set in parallel lists.
+        self._ml = ModList(mods)
+
+    def set_mods(self, mods: List[ModInfo]) -> None:
+        old = self._ml
+        new = ModList(mods)
+        new.set_filter(self._filter_cf)
+
+        # Same row set AND same filtered projection (the common rescan
+        # outcome): swap the columns in place and repaint only rows
+        # whose visible fields changed — a full model reset would drop
+        # selection and scroll position. Equal rels alone aren't
+        # enough: search keys cover manifest metadata, so an author
+        # edit under an active filter can change visible_idx, and that
+        # is a structural change the view must be told about.
+        if old.rels == new.rels and old.visible_idx == new.visible_idx:
+            changed = [
+                i for i in range(len(new.rels))
+                if (old.types[i], old.err_flags[i], old.warn_flags[i])
+                != (new.types[i], new.err_flags[i], new.warn_flags[i])
+            ]
+            self._ml = new
+            if changed:
+                changed_set = set(changed)
+                for row, idx in enumerate(new.visible_idx):
+                    if idx in changed_set:
+                        qi = self.index(row, 0)
+                        self.dataChanged.emit(qi, qi, [Qt.DisplayRole, Qt.ToolTipRole])
+            return
+
+        # Different row set: diff the visible projections by rel path
+        # and emit targeted insert/remove blocks, so a single imported
+        # or deleted mod doesn't tear down every delegate. Large deltas
+        # (and the startup fill) still go through a plain reset.
+        old_vis = [old.rels[i] for i in old.visible_idx]
+        new_vidx = list(new.visible_idx)
+        new_vis = [new.rels[i] for i in new_vidx]
+        ops = difflib.SequenceMatcher(
+            a=old_vis, b=new_vis, autojunk=False
+        ).get_opcodes()
+        delta = sum(
+            (i2 - i1) + (j2 - j1) for tag, i1, i2, j1, j2 in ops if tag != "equal"
+        )
+        if delta * 2 > max(len(old_vis), len(new_vis), 1):
+            self.beginResetModel()
+            self._ml = new
+            self.endResetModel()
+            return
+
+        # 1) Remove vanished rows, back to front so indices stay valid.
+        #    The old columns still back the view, so it stays consistent.
+        cur = list(old.visible_idx)
+        for tag, i1, i2, j1, j2 in reversed(ops):
+            if tag in ("delete", "replace"):
+                self.beginRemoveRows(QModelIndex(), i1, i2 - 1)
+                del cur[i1:i2]
+                old.visible_idx = array.array("i", cur)
+                self.endRemoveRows()
+
+        # 2) Swap to the new columns under the surviving rows — same
+        #    rels in the same order, so no structural notification, just
+        #    a repaint for rows whose visible fields changed.
+        surviving = []
+        for tag, i1, i2, j1, j2 in ops:
+            if tag == "equal":
+                surviving.extend(new_vidx[j1:j2])
+        self._ml = new
+        new.visible_idx = array.array("i", surviving)
+        old_pos = {rel: oi for oi, rel in enumerate(old.rels)}
+        for row, i in enumerate(surviving):
+            rel = new.rels[i]
+            oi = old_pos[rel]
+            if (old.types[oi], old.err_flags[oi], old.warn_flags[oi]) != (
+                new.types[i], new.err_flags[i], new.warn_flags[i]
+            ):
+                qi = self.index(row, 0)
+                self.dataChanged.emit(qi, qi, [Qt.DisplayRole, Qt.ToolTipRole])
+
+        # 3) Insert new rows front to back; at each step the rows before
+        #    the block already match the final layout, so the block's
+        #    final position is its insertion point.
+        cur = surviving
+        for tag, i1, i2, j1, j2 in ops:
+            if tag in ("insert", "replace"):
+                self.beginInsertRows(QModelIndex(), j1, j2 - 1)
+                cur[j1:j1] = new_vidx[j1:j2]
+                new.visible_idx = array.array("i", cur)
+                self.endInsertRows()
+
+    def row_for_rel(self, rel_path: str) -> int:
+        """Visible row showing rel_path, or -1."""
+        ml = self._ml
+        for row, i in enumerate(ml.visible_idx):
+            if ml.rels[i] == rel_path:
+                return row
+        return -1
+
+    def set_filter(self, text: str) -> None:
+        if text == self.filter:
+            return
+        # Row count changes with the filter, which is a reset in model
+        # terms — layoutChanged is for reordering existing rows and
+        # leaves views with stale persistent indexes.
+        self.beginResetModel()
+        self.filter = text
+        self._filter_cf = text.casefold()
+        self._ml.set_filter(self._filter_cf)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return len(self._ml.visible_idx)
+
+    def mod_at(self, row: int) -> ModInfo:
+        """ModInfo behind a visible row, without materializing the
+        filtered list — one index lookup per call."""
+        ml = self._ml
+        return ml.infos[ml.visible_idx[row]]
+
+    def data(self, index: QModelIndex, role: int):
+        ml = self._ml
+        i = ml.visible_idx[index.row()]
+
+        if role == Qt.DisplayRole:
+            return ml.displays[i]
+
+        if role == Qt.CheckStateRole:
+            # Painting asks for this per visible row; go straight to the
+            # enabled set rather than through the method call.
+            return Qt.Checked if ml.rels[i] in self.cfg._enabled_set else Qt.Unchecked
+
+        if role == Qt.ToolTipRole:
+            return ml.infos[i].tooltip_text
+
+        return None
+
+    def flags(self, index: QModelIndex):
+        base = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        if self._ml.err_flags[self._ml.visible_idx[index.row()]]:
+            return base
+        return base | Qt.ItemIsUserCheckable
+
+    def setData(self, index: QModelIndex, value, role: int) -> bool:
+        if role != Qt.CheckStateRole:
+            return False
+        if self.is_loading_fn():
+            return False
+        if not self._user_toggle_gate:
+            return False
+
+        ml = self._ml
+        i = ml.visible_idx[index.row()]
+        rel = ml.rels[i]
+        if ml.err_flags[i] and value == Qt.Checked:
+            self.status_fn("Mod has errors — cannot enable")
+            return False
+
+        enabled = (value == Qt.Checked)
+        self.cfg.set_enabled(rel, enabled)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+
+        self.status_fn(f"{'Enabled' if enabled else 'Disabled'}: {rel}")
+        self.on_toggle_cb()
+        return True
+
+    def set_enabled_bulk(self, rows: List[int], checked: bool) -> int:
+        """
+        Toggle many visible rows at once: one ranged CheckStateRole
+        signal and one queued config write instead of one per row.
+        Rows with errors are skipped when enabling. Returns how many
+        rows actually changed.
+        """
+        if self.is_loading_fn():
+            return 0
+        ml = self._ml
+        changed = []
+        for row in rows:
+            i = ml.visible_idx[row]
+            if checked and ml.err_flags[i]:
+                continue
+            rel = ml.rels[i]
+            if self.cfg.is_enabled(rel) == checked:
+                continue
+            # set_enabled's save is debounced, so the burst coalesces
+            # into a single write anyway
+            self.cfg.set_enabled(rel, checked)
+            changed.append(row)
+        if not changed:
+            return 0
+        self.dataChanged.emit(
+            self.index(min(changed), 0),
+            self.index(max(changed), 0),
+            [Qt.CheckStateRole],
+        )
+        self.status_fn(f"{'Enabled' if checked else 'Disabled'} {len(changed)} mod(s)")
+        self.on_toggle_cb()
+        return len(changed)
+
+
+class ModListView(QListView):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.ExtendedSelection)
+
+    def mousePressEvent(self, event):
+        idx = self.indexAt(event.pos())
+        if idx.isValid():
+            opt = QStyleOptionViewItem()
+            self.itemDelegate().initStyleOption(opt, idx)
+            opt.rect = self.visualRect(idx)
+
+            style = self.style()
+            check_rect = style.subElementRect(QStyle.SE_ItemViewItemCheckIndicator, opt, self)
+
+            if check_rect.contains(event.pos()):
+                model = self.model()
+                current = model.data(idx, Qt.CheckStateRole)
+                new_state = Qt.Unchecked if current == Qt.Checked else Qt.Checked
+
+                model._user_toggle_gate = True
+                try:
+                    model.setData(idx, new_state, Qt.CheckStateRole)
+                finally:
+                    model._user_toggle_gate = False
+                return
+
+        super().mousePressEvent(event)
+
+    def keyPressEvent(self, event):
+        # Space toggles the whole selection in one model call
+        if event.key() == Qt.Key_Space:
+            rows = sorted(i.row() for i in self.selectionModel().selectedRows())
+            if rows:
+                model = self.model()
+                cur = self.currentIndex()
+                anchor = cur if cur.isValid() else model.index(rows[0], 0)
+                checked = model.data(anchor, Qt.CheckStateRole) != Qt.Checked
+                model.set_enabled_bulk(rows, checked)
+                return
+        super().keyPressEvent(event)
+
+
+# =========================================================
+# Main window
+# =========================================================
+
+class MainWindow(QMainWindow):
+    FOLDER_NAME = "EndfieldModSafe"
+
+    def __init__(self, project_root: Path):
+        super().__init__()
+        self.project_root = project_root
+        self.mods_root = project_root / "mods"
+
+        self.cfg = AppConfig.load(project_root)
+        self.mods: List[ModInfo] = []
+        self._mods_by_rel: dict = {}
+
+        self.renderer_choice = load_renderer_choice(self.project_root)
+        self._renderer_args = build_renderer_args(self.renderer_choice)
+        self._game_root_cache: Optional[tuple] = None  # (exe str, root Path)
+
+        self._loading_ui = False
+        self._deploy_task = None
+        self._import_task = None
+        self._install_task = None
+        self._scan_task = None
+        self._build_task = None
+        self._last_enabled_snapshot: Optional[tuple] = None
+        # Last conflict-detection results, keyed by enabled set + tree
+        # fingerprint: repeat deploys with nothing changed skip the walk.
+        self._conflict_memo: dict = {}
+        self.statusBar().showMessage("Ready")
+
+        self._build_timer = QTimer()
+        self._build_timer.setSingleShot(True)
+        self._build_timer.timeout.connect(self._do_build_active)
+
+        # Enabled-box repaints coalesce too: bulk toggles mark it stale
+        # and it redraws once when the burst settles.
+        self._enabled_box_timer = QTimer()
+        self._enabled_box_timer.setSingleShot(True)
+        self._enabled_box_timer.setInterval(100)
+        self._enabled_box_timer.timeout.connect(self.update_enabled_box)
+
+        # Coalesces bursts of programmatic rescans (imports, installs)
+        # into a single scan, same pattern as the build timer above.
+        self._refresh_timer = QTimer()
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+        # Keystrokes coalesce for 120 ms before the filter re-runs, so
+        # typing a word costs one filter pass instead of one per letter.
+        self._search_timer = QTimer()
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(120)
+        self._search_timer.timeout.connect(self._apply_search)
+
+        # Event-driven rescans: watch mods/ and its top-level folders so
+        # external edits (dropped packs, deletions) show up without
+        # pressing Refresh. Events invalidate the scan cache and funnel
+        # through the refresh coalescer; _active is not watched, so our
+        # own builds don't trigger rescans of an unchanged tree.
+        self._fs_watcher = QFileSystemWatcher(self)
+        self._fs_watcher.directoryChanged.connect(self._on_tree_changed)
+        self._fs_watcher.fileChanged.connect(self._on_tree_changed)
+        self._sync_fs_watcher()
+
+        self.model = ModsModel(
+            [],
+            self.cfg,
+            on_toggle_cb=self.queue_build_active,
+            is_loading_fn=lambda: self._loading_ui,
+            status_fn=self.set_status
+        )
+
+        self.setWindowTitle("Endfield Mod Loader (Safe + Asset Replacement)")
+        self.resize(1180, 720)
+
+        root = QWidget()
+        self.setCentralWidget(root)
+        outer = QVBoxLayout(root)
+
+        # ---------------- Top Bar ----------------
+        top = QHBoxLayout()
+
+        top.addWidget(QLabel("Actions"))
+
+        self.actions = QComboBox()
+        self.actions.addItems([
+            "Install Mod Folder",
+            "Build Active Pack",
+            "Restore (Safe + Assets)",
+            "Open Safe Deployed Folder",
+        ])
+        self.actions.setToolTip("Pick an action, then click Run")
+        top.addWidget(self.actions)
+
+        self.btn_run_action = QPushButton("← Run")
+        self.btn_run_action.setToolTip("Runs the selected action from the dropdown")
+        self.btn_run_action.clicked.connect(self.run_selected_action)
+        top.addWidget(self.btn_run_action)
+
+        self.btn_import_zip = QPushButton("Import Mod ZIP")
+        self.btn_import_zip.clicked.connect(self.import_mod_zip)
+        top.addWidget(self.btn_import_zip)
+
+        self.btn_open_folder = QPushButton("Open Mod Folder")
+        self.btn_open_folder.clicked.connect(self.open_selected_mod_folder)
+        top.addWidget(self.btn_open_folder)
+
+        top.addStretch(1)
+
+        self.search = QLineEdit()
+        self.search.setPlaceholderText("Search mods...")
+        self.search.textChanged.connect(self.on_search)
+        top.addWidget(self.search)
+
+        self.btn_refresh = QPushButton("Refresh")
+        self.btn_refresh.clicked.connect(self.force_refresh)
+        top.addWidget(self.btn_refresh)
+
+        self.renderer_combo = QComboBox()
+        self.renderer_combo.addItems(["Renderer: Auto", "Renderer: Force DX11", "Renderer: Force DX12"])
+        self.renderer_combo.setCurrentIndex(1 if self.renderer_choice == "dx11" else 2 if self.renderer_choice == "dx12" else 0)
+        self.renderer_combo.currentIndexChanged.connect(self.on_renderer_changed)
+        top.addWidget(self.renderer_combo)
+
+        self.btn_deploy = QPushButton("Deploy Mods")
+        # clicked(bool) would land its checked argument in deploy_all's
+        # `then` callback slot — connect through a zero-arg lambda
+        self.btn_deploy.clicked.connect(lambda: self.deploy_all())
+        top.addWidget(self.btn_deploy)
+
+        self.btn_set_game = QPushButton("Set Game EXE")
+        self.btn_set_game.clicked.connect(self.pick_game_exe)
+        top.addWidget(self.btn_set_game)
+
+        self.btn_launch = QPushButton("Launch Game")
+        self.btn_launch.clicked.connect(self.launch_game)
+        top.addWidget(self.btn_launch)
+
+        outer.addLayout(top)
+
+        # ---------------- Main Split ----------------
+        splitter = QSplitter(Qt.Horizontal)
+        outer.addWidget(splitter, 1)
+
+        self.list_view = ModListView()
+        # Every row is one elided line, so tell the view: uniform sizes
+        # skip per-row geometry, batched layout keeps huge lists from
+        # blocking the first paint, and middle-elide stops long rel
+        # paths from forcing re-layout on resize.
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setLayoutMode(QListView.Batched)
+        self.list_view.setBatchSize(256)
+        self.list_view.setResizeMode(QListView.Adjust)
+        self.list_view.setTextElideMode(Qt.ElideMiddle)
+        self.list_view.setWordWrap(False)
+        self.list_view.setModel(self.model)
+        self.list_view.clicked.connect(self.on_select)
+        splitter.addWidget(self.list_view)
+
+        right = QWidget()
+        r = QVBoxLayout(right)
+
+        self.details_title = QLabel("Select a mod")
+        self.details_title.setStyleSheet("font-size:16px; font-weight:600;")
+        self.details = QPlainTextEdit()
+        self.details.setReadOnly(True)
+        self.details.setFixedHeight(260)
+
+        self.active_title = QLabel("Enabled mods")
+        self.active_box = QPlainTextEdit()
+        self.active_box.setReadOnly(True)
+        self.active_box.setFixedHeight(150)
+
+        self.game_title = QLabel("Game EXE")
+        self.game_box = QLineEdit()
+        self.game_box.setReadOnly(True)
+
+        self.log_title = QLabel("Log")
+        # Plain-text document: no rich-text layout engine, and the block
+        # cap trims old lines so a long session can't slow later appends.
+        self.log = QPlainTextEdit()
+        self.log.setReadOnly(True)
+        self.log.setUndoRedoEnabled(False)
+        self.log.setMaximumBlockCount(1000)
+        self._log_formats: dict = {}
+
+        # Log lines buffer for up to 50 ms and flush as one insert:
+        # deploys emit hundreds of lines and per-line append() pays a
+        # signal round and a relayout each time.
+        self._log_buffer: List[tuple] = []
+        self._log_timer = QTimer()
+        self._log_timer.setSingleShot(True)
+        self._log_timer.timeout.connect(self._flush_log)
+
+        r.addWidget(self.details_title)
+        r.addWidget(self.details)
+        r.addWidget(self.active_title)
+        r.addWidget(self.active_box)
+        r.addWidget(self.game_title)
+        r.addWidget(self.game_box)
+        r.addWidget(self.log_title)
+        r.addWidget(self.log, 1)
+
+        splitter.addWidget(right)
+        splitter.setSizes([520, 660])
+
+        self.refresh()
+
+    # =========================================================
+    # Actions dropdown runner
+    # =========================================================
+    def run_selected_action(self):
+        action = (self.actions.currentText() or "").strip()
+
+        if action == "Install Mod Folder":
+            self.install_mod_folder()
+            return
+        if action == "Build Active Pack":
+            self.queue_build_active()
+            return
+        if action == "Restore (Safe + Assets)":
+            self.restore_all()
+            return
+        if action == "Open Safe Deployed Folder":
+            self.open_deployed_folder()
+            return
+
+        QMessageBox.information(self, "Unknown action", f"Unhandled action:\n{action}")
+
+    # =========================================================
+    # Log validation (red/green)
+    # =========================================================
+    def log_ok(self, msg: str) -> None:
+        self._log_color(msg, color="#22c55e")
+
+    def log_bad(self, msg: str) -> None:
+        self._log_color(msg, color="#ef4444")
+
+    def log_warn(self, msg: str) -> None:
+        self._log_color(msg, color="#f59e0b")
+
+    def log_info(self, msg: str) -> None:
+        self._log_color(msg, color="#e5e7eb")
+
+    def _log_color(self, msg: str, color: str) -> None:
+        # Plain text — no HTML escaping round trip
+        self._log_buffer.append((msg or "", color))
+        if not self._log_timer.isActive():
+            self._log_timer.start(50)
+
+    def _log_format(self, color: str) -> QTextCharFormat:
+        fmt = self._log_formats.get(color)
+        if fmt is None:
+            fmt = QTextCharFormat()
+            fmt.setForeground(QColor(color))
+            self._log_formats[color] = fmt
+        return fmt
+
+    def _flush_log(self) -> None:
+        if not self._log_buffer:
+            return
+        lines = self._log_buffer
+        self._log_buffer = []
+
+        # One layout pass for the whole batch
+        self.log.setUpdatesEnabled(False)
+        self.log.blockSignals(True)
+        try:
+            cursor = self.log.textCursor()
+            cursor.movePosition(QTextCursor.End)
+            cursor.beginEditBlock()
+            for msg, color in lines:
+                cursor.insertText(msg + "\n", self._log_format(color))
+            cursor.endEditBlock()
+        finally:
+            self.log.blockSignals(False)
+            self.log.setUpdatesEnabled(True)
+
+        sb = self.log.verticalScrollBar()
+        sb.setValue(sb.maximum())
+
+    def on_renderer_changed(self, idx: int):
+        if idx == 1:
+            self.renderer_choice = "dx11"
+        elif idx == 2:
+            self.renderer_choice = "dx12"
+        else:
+            self.renderer_choice = "auto"
+        self._renderer_args = build_renderer_args(self.renderer_choice)
+        save_renderer_choice(self.project_root, self.renderer_choice)
+        self.set_status(f"Renderer set: {self.renderer_choice}")
+
+    def _game_root(self) -> Optional[Path]:
+        exe = self.cfg.game_exe
+        if not exe:
+            return None
+        # resolve() stats the path; cache per exe string since the
+        # answer only changes when the user picks a new EXE.
+        cached = self._game_root_cache
+        if cached is not None and cached[0] == exe:
+            return cached[1]
+        root = Path(exe).resolve().parent
+        self._game_root_cache = (exe, root)
+        return root
+
+    def set_status(self, msg: str):
+        count = len(self.cfg.enabled_mods)
+        final = f"{msg} | Enabled mods: {count}"
+        self.statusBar().showMessage(final)
+        self.log_info(f"[Status] {final}")
+
+    def _enabled_mods_have_errors(self) -> bool:
+        # enabled_mods and ModInfo.rel_path are both slash-normalized at
+        # the source, and the rel->mod map is rebuilt once per scan, so
+        # this is a pure lookup loop.
+        by_rel = self._mods_by_rel
+        for rel in self.cfg.enabled_mods:
+            m = by_rel.get(rel)
+            if m is not None and m.errors:
+                return True
+        return False
+
+    def _memo_conflicts(self, kind: str, detect_fn) -> list:
+        """
+        Run detect_fn() unless the enabled set and the tree fingerprint
+        match the last run; formatting and status stay per-call. Deep
+        edits that don't touch top-level mtimes are caught by refresh()
+        clearing the memo, same as the scan cache.
+        """
+        fp = _scan_fingerprint(self.mods_root)
+        key = (tuple(sorted(self.cfg.enabled_mods)), fp) if fp is not None else None
+        hit = self._conflict_memo.get(kind)
+        if key is not None and hit is not None and hit[0] == key:
+            return hit[1]
+        conflicts = detect_fn()
+        if key is not None:
+            self._conflict_memo[kind] = (key, conflicts)
+        return conflicts
+
+    def _check_conflicts(self) -> List[str]:
+        conflicts = self._memo_conflicts(
+            "path",
+            lambda: detect_enabled_path_conflicts(self.mods_root, self.cfg.enabled_mods),
+        )
+        if not conflicts:
+            return []
+        lines: List[str] = []
+        for c in conflicts[:50]:
+            lines.append(f"{c.get('path','')}  <=  {', '.join(c.get('mods', []))}")
+        self.set_status(f"Conflicts: {len(conflicts)} (Deploy blocked)")
+        return lines
+
+    def _check_asset_conflicts(self, index: Optional[ModIndex] = None) -> List[str]:
+        conflicts = self._memo_conflicts(
+            "asset",
+            lambda: detect_enabled_asset_conflicts(self.mods_root, self.cfg.enabled_mods, index=index),
+        )
+        if not conflicts:
+            return []
+        lines: List[str] = []
+        for c in conflicts[:50]:
+            lines.append(f"{c.get('path','')}  <=  {', '.join(c.get('mods', []))}")
+        self.set_status(f"Asset Conflicts: {len(conflicts)} (Deploy blocked)")
+        return lines
+
+    def on_search(self, text: str):
+        self._search_timer.start()
+
+    def _apply_search(self):
+        text = self.search.text().strip()
+        # A single character matches almost every row, so the pass is
+        # all cost and no signal — wait for a second character.
+        if len(text) < 2:
+            text = ""
+        self.model.set_filter(text)
+
+    def queue_refresh(self, delay_ms: int = 150):
+        self._refresh_timer.start(delay_ms)
+
+    def _sync_fs_watcher(self):
+        wanted = set()
+        if self.mods_root.exists():
+            wanted.add(str(self.mods_root))
+            try:
+                with os.scandir(self.mods_root) as it:
+                    for e in it:
+                        if e.is_dir(follow_symlinks=False) and e.name.lower() != "_active":
+                            wanted.add(e.path)
+            except OSError:
+                pass
+
+        # Only touch the delta: re-adding an unchanged path tears down
+        # and re-creates its native watch for nothing.
+        watched = set(self._fs_watcher.directories())
+        stale = list(watched - wanted)
+        fresh = list(wanted - watched)
+        if stale:
+            self._fs_watcher.removePaths(stale)
+        if fresh:
+            self._fs_watcher.addPaths(fresh)
+
+    def _on_tree_changed(self, _path: str):
+        invalidate_scan_cache()
+        # Longer delay than UI-driven refreshes: a bulk drop in Explorer
+        # arrives as a burst of per-file events.
+        self.queue_refresh(500)
+
+    def force_refresh(self):
+        # The scan cache's fingerprint only covers the top levels of the
+        # mods tree (and the watcher only sees the same), so deep edits
+        # can slip past it. An explicit Refresh is the user saying
+        # "look again" — always rescan from disk.
+        invalidate_scan_cache()
+        self.refresh()
+
+    def refresh(self):
+        # Cold scans stat every mod folder, which stutters the UI when
+        # run on the GUI thread — run on the pool and apply the result
+        # back on the GUI thread. If a scan is already in flight, just
+        # re-queue; the coalescing timer keeps this from piling up.
+        if self._scan_task is not None:
+            self.queue_refresh()
+            return
+        self.btn_refresh.setEnabled(False)
+
+        mods_root = self.mods_root
+
+        def job(log_fn, progress_fn):
+            return scan_mods(mods_root)
+
+        task = _BgTask(job)
+        task.signals.done.connect(self._on_scan_done)
+        self._scan_task = task  # keep alive until done fires
+        QThreadPool.globalInstance().start(task)
+
+    def _on_scan_done(self, res):
+        self._scan_task = None
+        self.btn_refresh.setEnabled(True)
+        if isinstance(res, Exception):
+            self.log_bad(f"Scan failed: {res}")
+            self.set_status("Scan failed")
+            return
+
+        # Fingerprint cache hit: the worker handed back the exact list
+        # object we already hold, so the model, conflict memo, watcher
+        # and selection are all still valid — nothing to do.
+        if res is self.mods:
+            self.set_status(f"Scan: Found {len(res)} mods (unchanged)")
+            return
+
+        self._loading_ui = True
+        self.list_view.blockSignals(True)
+        # Hold repaints while the rows churn — the reset/diff plus the
+        # selection restore collapse into a single repaint at the end.
+        self.list_view.setUpdatesEnabled(False)
+        try:
+            cur = self.list_view.currentIndex()
+            cur_rel = self.model.mod_at(cur.row()).rel_path if cur.isValid() else None
+
+            self.mods = res
+            self._mods_by_rel = {m.rel_path: m for m in self.mods}
+            self.model.set_mods(self.mods)
+            self._conflict_memo.clear()
+
+            # A reset clears the selection; put it back if the mod survived
+            if cur_rel is not None and not self.list_view.currentIndex().isValid():
+                row = self.model.row_for_rel(cur_rel)
+                if row >= 0:
+                    self.list_view.setCurrentIndex(self.model.index(row, 0))
+        finally:
+            self.list_view.setUpdatesEnabled(True)
+            self.list_view.blockSignals(False)
+            self._loading_ui = False
+
+        self.update_enabled_box()
+        self.game_box.setText(self.cfg.game_exe or "")
+        self.set_status(f"Scan: Found {len(self.mods)} mods")
+        # Top-level folders may have appeared or vanished
+        self._sync_fs_watcher()
+
+    def update_enabled_box(self):
+        enabled = tuple(sorted(self.cfg.enabled_mods))
+        # Refresh and every toggle funnel through here; re-setting the
+        # same text still relayouts the widget, so skip no-ops.
+        if enabled == self._last_enabled_snapshot:
+            return
+        self._last_enabled_snapshot = enabled
+        self.active_box.setPlainText("\n".join(enabled) if enabled else "(none)")
+
+    def on_select(self, index: QModelIndex):
+        m = self.model.mod_at(index.row())
+        self.details_title.setText(f"{m.name} — {m.rel_path}")
+        # Rendered once at scan time (mods.scan_mods); selection is O(1).
+        self.details.setPlainText(m.details_text)
+
+        self.set_status("Mod has errors — cannot enable" if m.errors else f"Selected: {m.rel_path}")
+
+    def queue_build_active(self):
+        self._enabled_box_timer.start()
+        self._build_timer.start(300)
+        self.set_status("Build: queued...")
+
+    def _do_build_active(self):
+        # The build walks and copies mod trees — run it on the pool like
+        # deploy does, with log lines coming back as queued signals. If
+        # one is already in flight — or a deploy is, whose job rebuilds
+        # and walks the same _active tree — re-queue through the
+        # debounce timer rather than racing it.
+        if self._build_task is not None or self._deploy_task is not None:
+            self._build_timer.start(300)
+            return
+
+        mods_root = self.mods_root
+        enabled = list(self.cfg.enabled_mods)  # snapshot: worker must not see toggles
+        use_hardlinks = self.cfg.use_hardlinks
+
+        def job(log_fn, progress_fn):
+            return build_active(
+                mods_root, enabled, use_hardlinks=use_hardlinks, log_fn=log_fn
+            )
+
+        task = _BgTask(job)
+        task.signals.log.connect(self.log_info)
+        task.signals.done.connect(self._on_build_done)
+        self._build_task = task  # keep alive until done fires
+        QThreadPool.globalInstance().start(task)
+
+    def _on_build_done(self, res):
+        self._build_task = None
+        if isinstance(res, Exception):
+            self.set_status("Build: failed")
+            self.log_bad(f"[Build] {res}")
+            return
+        self.set_status("Build: OK")
+        self.log_info(f"[Build] Active pack built at: {res}")
+
+    # =========================================================
+    # Import Mod ZIP (GameBanana)
+    # =========================================================
+    def import_mod_zip(self):
+        zip_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Select Mod ZIP",
+            filter="ZIP/Archive Files (*.zip *.tar *.gz *.tgz);;All Files (*.*)"
+        )
+        if not zip_path:
+            return
+
+        zip_file = Path(zip_path)
+        if not zip_file.exists():
+            QMessageBox.warning(self, "Missing file", f"File not found:\n{zip_file}")
+            return
+
+        dest_parent = self.mods_root / "misc"
+        dest_parent.mkdir(parents=True, exist_ok=True)
+
+        # Unpack + move are pure filesystem work; run them on the pool so
+        # a multi-GB archive doesn't freeze the window. Extracting into a
+        # scratch dir on the destination volume means the final step is a
+        # rename instead of a second byte-for-byte copy of the pack.
+        def job(log_fn, progress_fn):
+            scratch = Path(tempfile.mkdtemp(prefix="endfield_mod_import_", dir=dest_parent))
+            try:
+                shutil.unpack_archive(str(zip_file), str(scratch))
+
+                chosen_dir, suggested_name = _pick_best_mod_folder(scratch)
+
+                name = suggested_name if suggested_name.lower() not in GENERIC_WRAPPER_NAMES else zip_file.stem
+
+                dest = _unique_dest(dest_parent, name)
+                os.replace(chosen_dir, dest)
+
+                # One fused walk answers both kind probes
+                looks_migoto, looks_asset, _ = _classify_mod_dir(os.fspath(dest))
+                kind = "3DMigoto (Texture/Buffer)" if looks_migoto else ("Asset (Endfield_Data/...)" if looks_asset else "Folder")
+            finally:
+                # Leftover wrapper dirs (or everything, on failure)
+                shutil.rmtree(scratch, ignore_errors=True)
+            return dest, kind
+
+        self.set_status(f"Importing: {zip_file.name}...")
+        self.btn_import_zip.setEnabled(False)
+        task = _BgTask(job)
+        task.signals.log.connect(self.log_info)
+        task.signals.done.connect(lambda res: self._on_import_done(res, zip_file))
+        self._import_task = task  # keep alive until done fires
+        QThreadPool.globalInstance().start(task)
+
+    def _on_import_done(self, res, zip_file: Path):
+        self._import_task = None
+        self.btn_import_zip.setEnabled(True)
+
+        if isinstance(res, shutil.ReadError):
+            QMessageBox.critical(
+                self,
+                "Import failed",
+                "Could not unpack this archive.\n\n"
+                "Only .zip/.tar/.gz supported by Python's unpacker.\n"
+                "If it's a .rar or .7z, extract it manually first, then use 'Install Mod Folder'."
+            )
+            return
+        if isinstance(res, Exception):
+            QMessageBox.critical(self, "Import failed", str(res))
+            return
+
+        dest, kind = res
+        self.log_ok(f"[Import] Imported ZIP -> {dest} ({kind})")
+        invalidate_scan_cache()
+        self.set_status(f"Imported: {zip_file.name}")
+        self.queue_refresh()
+
+    # =========================================================
+    # Deploy / Restore / Open
+    # =========================================================
+    def deploy_all(self, then=None):
+        if self._deploy_task is not None:
+            self.set_status("Deploy already running...")
+            return
+        if not self.cfg.game_exe:
+            QMessageBox.warning(self, "No game exe", "Click 'Set Game EXE' first.")
+            return
+
+        # Toggles are saved debounced; make sure the deploy sees the
+        # state the user sees.
+        self.cfg.flush()
+
+        # One walk of the enabled mods, shared by conflict detection and
+        # the deploys below.
+        index = ModIndex.build(self.mods_root, self.cfg.enabled_mods)
+
+        conflicts = self._check_conflicts()
+        if conflicts:
+            QMessageBox.warning(self, "Conflicts detected", "Fix these first:\n\n- " + "\n- ".join(conflicts))
+            return
+
+        asset_conflicts = self._check_asset_conflicts(index)
+        if asset_conflicts:
+            QMessageBox.warning(self, "Asset Conflicts detected", "Fix these first:\n\n- " + "\n- ".join(asset_conflicts))
+            return
+
+        if self._enabled_mods_have_errors():
+            QMessageBox.warning(self, "Blocked", "One or more enabled mods has errors. Fix that first.")
+            return
+
+        if not self._game_root():
+            QMessageBox.warning(self, "No game root", "Bad EXE path.")
+            return
+
+        # Never run two build_active calls against the same tree at once
+        if self._build_task is not None:
+            self.set_status("Deploy: waiting for active-pack build...")
+            QTimer.singleShot(300, lambda: self.deploy_all(then))
+            return
+        self._build_timer.stop()  # deploy rebuilds the pack itself
+
+        self.set_status("Deploy: running...")
+
+        # The build and the copy-heavy deploy both run on the thread
+        # pool so the window stays responsive; logs/progress come back
+        # via queued signals.
+        project_root = self.project_root
+        mods_root = self.mods_root
+        enabled_mods = list(self.cfg.enabled_mods)
+        game_exe = self.cfg.game_exe
+        use_hardlinks = self.cfg.use_hardlinks
+
+        def job(log_fn, progress_fn):
+            build_active(
+                mods_root, enabled_mods, use_hardlinks=use_hardlinks, log_fn=log_fn
+            )
+            result = deploy_endfield_modsafe(
+                project_root=project_root,
+                mods_root=mods_root,
+                enabled_mods=enabled_mods,
+                game_exe=game_exe,
+                folder_name=self.FOLDER_NAME,
+                progress_fn=progress_fn,
+            )
+            log_fn(f"[SafeDeploy] {getattr(result, 'dest_active', '')}")
+
+            migoto_files = deploy_3dmigoto_folder_mods(
+                mods_root=mods_root,
+                enabled_mods=enabled_mods,
+                game_exe=game_exe,
+                log_fn=log_fn,
+                index=index,
+            )
+
+            asset_files = deploy_assets_no_manifest(
+                project_root=project_root,
+                mods_root=mods_root,
+                enabled_mods=enabled_mods,
+                game_exe=game_exe,
+                log_fn=log_fn,
+                progress_fn=progress_fn,
+                index=index,
+            )
+            return result, migoto_files, asset_files
+
+        self.btn_deploy.setEnabled(False)
+        self.btn_launch.setEnabled(False)
+
+        task = _BgTask(job)
+        task.signals.log.connect(self.log_info)
+        task.signals.progress.connect(self._on_deploy_progress)
+        task.signals.done.connect(lambda res: self._on_deploy_done(res, then))
+        self._deploy_task = task  # keep alive until done fires
+        QThreadPool.globalInstance().start(task)
+
+    def _on_deploy_progress(self, done: int, total: int):
+        self.statusBar().showMessage(f"Deploy: copying {done}/{total} files...")
+
+    def _on_deploy_done(self, res, then=None):
+        self._deploy_task = None
+        self.btn_deploy.setEnabled(True)
+        self.btn_launch.setEnabled(True)
+
+        if isinstance(res, PermissionError):
+            QMessageBox.critical(self, "Deploy failed", f"Permission denied.\n\n{res}")
+            return
+        if isinstance(res, Exception):
+            QMessageBox.critical(self, "Deploy failed", str(res))
+            return
+
+        result, migoto_files, asset_files = res
+
+        safe_count = int(getattr(result, "file_count", 0) or 0)
+        if safe_count > 0:
+            self.log_ok(f"[SafeDeploy] OK — {safe_count} file(s) active-mounted")
+        else:
+            self.log_warn("[SafeDeploy] Built active pack, but 0 files copied")
+
+        if migoto_files > 0:
+            self.log_ok(f"[3DMigoto] OK — {migoto_files} file(s) copied into game/Mods/")
+        else:
+            self.log_bad("[3DMigoto] NOT DEPLOYED — no Texture/Buffer/.dds/.buf/d3dx.ini detected in enabled mod(s)")
+
+        if asset_files > 0:
+            self.log_ok(f"[Assets] OK — {asset_files} file(s) replaced in game folder")
+        else:
+            self.log_warn("[Assets] No asset files deployed (must be under Endfield_Data/resources/game_files/etc).")
+
+        self.set_status(f"Deploy: OK (migoto: {migoto_files}, assets: {asset_files})")
+
+        if then is not None:
+            then()
+
+    def restore_all(self):
+        if not self.cfg.game_exe:
+            QMessageBox.warning(self, "No game exe", "Click 'Set Game EXE' first.")
+            return
+        try:
+            restore_endfield_modsafe(self.cfg.game_exe, folder_name=self.FOLDER_NAME)
+            self.log_ok("[SafeDeploy] Restored mounted active folder")
+
+            restored = restore_assets_no_manifest(
+                project_root=self.project_root,
+                game_exe=self.cfg.game_exe,
+                log_fn=self.log_info,
+                clear_receipt=True,
+            )
+            self.log_ok(f"[Assets] Restored/removed: {restored}" if restored > 0 else "[Assets] Nothing restored/removed (receipt empty)")
+
+            self.set_status("Restore: OK")
+        except Exception as e:
+            QMessageBox.critical(self, "Restore failed", str(e))
+
+    def open_deployed_folder(self):
+        if not self.cfg.game_exe:
+            QMessageBox.warning(self, "No game exe", "Click 'Set Game EXE' first.")
+            return
+        backend, safe_root, dest_active = get_modsafe_paths(self.cfg.game_exe, self.FOLDER_NAME)
+        if not dest_active.exists():
+            QMessageBox.information(self, "Not deployed yet", f"Deployed folder not found:\n{dest_active}\n\nClick Deploy first.")
+            return
+        QDesktopServices.openUrl(QUrl.fromLocalFile(str(dest_active)))
+        self.set_status(f"Opened deployed folder ({backend})")
+
+    def open_selected_mod_folder(self):
+        idx = self.list_view.currentIndex()
+        if not idx.isValid():
+            QMessageBox.information(self, "No selection", "Select a mod first.")
+            return
+        m = self.model.mod_at(idx.row())
+        folder = (self.mods_root / m.rel_path).resolve()
+        if not folder.exists():
+            QMessageBox.warning(self, "Missing folder", f"Folder not found:\n{folder}")
+            return
+        QDesktopServices.openUrl(QUrl.fromLocalFile(str(folder)))
+        self.set_status(f"Opened: {m.rel_path}")
+
+    # =========================================================
+    # Install folder / Game EXE / Launch
+    # =========================================================
+    def install_mod_folder(self):
+        src = QFileDialog.getExistingDirectory(self, "Select Mod Folder to Install")
+        if not src:
+            return
+
+        src_path = Path(src)
+        dest_parent = (self.mods_root / "misc")
+        dest_parent.mkdir(parents=True, exist_ok=True)
+
+        dest = dest_parent / src_path.name
+        if dest.exists():
+            res = QMessageBox.question(self, "Overwrite?", f"{dest} already exists.\nOverwrite it?")
+            if res != QMessageBox.Yes:
+                return
+
+        # The copy can be gigabytes; run it on the pool like the deploys.
+        # Copy into a scratch dir beside the destination first, so the
+        # old install disappears only once the new one is complete and
+        # the swap itself is a rename.
+        def job(log_fn, progress_fn):
+            scratch = Path(tempfile.mkdtemp(prefix="endfield_install_", dir=dest_parent))
+            try:
+                tmp_copy = scratch / src_path.name
+                shutil.copytree(src_path, tmp_copy)
+                if dest.exists():
+                    safe_rmtree(dest)
+                os.replace(tmp_copy, dest)
+            finally:
+                shutil.rmtree(scratch, ignore_errors=True)
+            return dest
+
+        self.set_status(f"Installing: {src_path.name}...")
+        task = _BgTask(job)
+        task.signals.done.connect(lambda res: self._on_install_done(res, src_path))
+        self._install_task = task  # keep alive until done fires
+        QThreadPool.globalInstance().start(task)
+
+    def _on_install_done(self, res, src_path: Path):
+        self._install_task = None
+
+        if isinstance(res, Exception):
+            QMessageBox.critical(self, "Install failed", str(res))
+            return
+
+        invalidate_scan_cache()
+        self.set_status(f"Installed: {src_path.name}")
+        self.queue_refresh()
+
+    def pick_game_exe(self):
+        exe, _ = QFileDialog.getOpenFileName(self, "Select Game EXE", filter="EXE Files (*.exe)")
+        if not exe:
+            return
+        self.cfg.set_game_exe(exe)
+        self.game_box.setText(exe)
+        self.set_status("Game EXE set")
+
+    def launch_game(self):
+        exe = self.cfg.game_exe
+        if not exe:
+            QMessageBox.warning(self, "No game exe", "Click 'Set Game EXE' first.")
+            return
+
+        exe_path = Path(exe)
+        if not exe_path.exists():
+            QMessageBox.warning(self, "Missing exe", f"EXE not found:\n{exe}")
+            return
+
+        # Deploy runs in the background; launch once it has finished.
+        self.deploy_all(then=lambda: self._launch_exe(exe_path))
+
+    def closeEvent(self, event):
+        self.cfg.flush()
+        super().closeEvent(event)
+
+    def _launch_exe(self, exe_path: Path):
+        args = self._renderer_args
+        self.log_info(f"[Launch] Renderer args: {' '.join(args)}" if args else "[Launch] Renderer args: (none)")
+
+        try:
+            if os.name == "nt":
+                launch_exe_windows(exe_path, args=args)
+            else:
+                subprocess.Popen([str(exe_path), *args], cwd=str(exe_path.parent))
+            self.set_status("Launch: OK")
+        except Exception as e:
+            QMessageBox.critical(self, "Launch failed", str(e))
+
+
+def run():
+    app = QApplication([])
+    project_root = Path(__file__).resolve().parents[1]
+    win = MainWindow(project_root)
+    win.show()
+    app.exec()